@@ -2,15 +2,16 @@ import os
 import re
 import logging
 import tempfile
+from io import BytesIO
 from typing import Any, Callable, Optional
-import pythoncom
-import win32com.client as win32
 from docxtpl import DocxTemplate
 from docx import Document
-from docx.shared import Mm
+from docx.shared import Mm, Emu
 from PIL import Image
 import copy
+import jinja2
 from jinja2 import Undefined
+from config.settings import Settings
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -20,6 +21,94 @@ if not logger.hasHandlers():
     handler.setFormatter(formatter)
     logger.addHandler(handler)
 
+# Shared Jinja2 environment with an on-disk bytecode cache so repeated renders
+# skip the parse -> AST -> codegen phase entirely. Built lazily so importing
+# this module does not touch the filesystem.
+_JINJA_ENV: jinja2.Environment = None
+
+
+def _get_jinja_env() -> jinja2.Environment:
+    global _JINJA_ENV
+    if _JINJA_ENV is None:
+        cache_dir = Settings.LOCAL_STORAGE["temp_path"] / "jinja_bcc"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        _JINJA_ENV = jinja2.Environment(
+            autoescape=False,
+            auto_reload=False,
+            bytecode_cache=jinja2.FileSystemBytecodeCache(str(cache_dir)),
+        )
+    return _JINJA_ENV
+
+
+class WordComSession:
+    """
+    Reusable Word COM session. Launching Word (CoInitialize + EnsureDispatch)
+    costs seconds; keeping one session resident amortizes that over a whole
+    batch of documents instead of paying it per insert_page_breaks call.
+
+    COM imports happen here, not at module scope, so the pure Jinja render
+    path never pays the win32 gencache/DLL load cost at startup.
+    """
+
+    def __init__(self) -> None:
+        self.word = None
+
+    def __enter__(self) -> "WordComSession":
+        import pythoncom
+        import win32com.client as win32
+        pythoncom.CoInitialize()
+        self.word = win32.gencache.EnsureDispatch('Word.Application')
+        self.word.Visible = False
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        import pythoncom
+        try:
+            if self.word is not None:
+                self.word.Quit()
+        finally:
+            self.word = None
+            pythoncom.CoUninitialize()
+        return False
+
+
+# Compiled once at module scope; matches [[ Image: key ]] markers.
+_IMAGE_RE = re.compile(r"\[\[\s*[Ii]mage:?\s*([^\]]+)\s*\]\]")
+
+# (width_emu, height_emu) per (path, target width); measuring an image with
+# PIL happens once per unique file instead of once per marker.
+_DIM_CACHE: dict = {}
+
+
+def _image_dims(path: str, target_mm: int) -> tuple:
+    key = (path, target_mm)
+    dims = _DIM_CACHE.get(key)
+    if dims is None:
+        with Image.open(path) as im:
+            w_px, h_px = im.size
+        width_emu = Mm(target_mm)
+        height_emu = Emu(int(round(h_px * width_emu / w_px)))
+        dims = (width_emu, height_emu)
+        _DIM_CACHE[key] = dims
+    return dims
+
+
+class _LazyPformat:
+    """Defers pprint.pformat until a log handler actually formats the record."""
+
+    def __init__(self, obj) -> None:
+        self.obj = obj
+
+    def __str__(self) -> str:
+        import pprint
+        return pprint.pformat(self.obj, indent=2, width=120)
+
+
+# Cache of compiled templates keyed by (path, mtime). DocxTemplate parses the
+# docx ZIP and compiles the Jinja source on construction; reusing the compiled
+# instance turns repeat renders of the same template into "render only".
+_TPL_CACHE: dict = {}
+
 REPEATABLE_FIELDS = [
     "systemDesc",
     "systemoption",
@@ -38,19 +127,21 @@ def flatten_jinja_repeatables(data: dict, repeatable_fields: list) -> dict:
     {'name.1': 'foo', 'description.1': 'bar'}
     This modifies the input dict in place and returns it for convenience.
     """
-    logger.info("[flatten_jinja_repeatables] Flattening repeatable fields...")
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
     for field in repeatable_fields:
-        if field in data and isinstance(data[field], dict):
-            new_block = {}
-            for subfield, subdict in data[field].items():
-                if isinstance(subdict, dict):
-                    for idx, value in subdict.items():
-                        new_block[f"{subfield}.{idx}"] = value
-                        logger.debug(f"[flatten_jinja_repeatables] Flattened: {field}.{subfield}.{idx} -> {value}")
-                else:
-                    new_block[subfield] = subdict
-            data[field] = new_block
-            logger.info(f"[flatten_jinja_repeatables] Field '{field}' flattened")
+        block = data.get(field)
+        if type(block) is not dict:
+            continue
+        new_block = {}
+        for subfield, subdict in block.items():
+            if type(subdict) is dict:
+                for idx, value in subdict.items():
+                    new_block[f"{subfield}.{idx}"] = value
+            else:
+                new_block[subfield] = subdict
+        data[field] = new_block
+        if debug_enabled:
+            logger.debug(f"[flatten_jinja_repeatables] Field '{field}' flattened ({len(new_block)} keys)")
     return data
 
 class WordSubmissionHandler:
@@ -69,9 +160,11 @@ class WordSubmissionHandler:
     def __init__(self, template_path: str, status_callback: Optional[Callable[[str], None]] = None) -> None:
         self.template_path = template_path
         self.status_callback = status_callback
-        self.doc: Optional[Document] = None
+        self._doc: Optional[Document] = None
         self.tpl: Optional[DocxTemplate] = None
         self.context: dict = {}
+        self._template_vars = None  # cached get_undeclared_template_variables()
+        self._flat_ctx: Optional[dict] = None  # flat dotted-key view of the last rendered context
         self._send_status(f"WordSubmissionHandler initialized with template: {template_path}")
 
     def _send_status(self, message: str) -> None:
@@ -79,6 +172,23 @@ class WordSubmissionHandler:
             self.status_callback(message)
         logger.info(message)
 
+    @property
+    def doc(self) -> Optional[Document]:
+        """
+        The working python-docx Document.
+
+        Before a render this falls back to the Document already parsed inside
+        DocxTemplate, avoiding a second full ZIP parse of the template;
+        render_template replaces it with the rendered document.
+        """
+        if self._doc is not None:
+            return self._doc
+        return self.tpl.docx if self.tpl is not None else None
+
+    @doc.setter
+    def doc(self, value: Optional[Document]) -> None:
+        self._doc = value
+
     @staticmethod
     def _unflatten_dict(flat: dict) -> dict:
         """
@@ -88,32 +198,37 @@ class WordSubmissionHandler:
         for key, value in flat.items():
             parts = key.split('.')
             d = result
-            for i, part in enumerate(parts):
-                if i < len(parts) - 1:
-                    if part not in d or not isinstance(d[part], dict):
-                        d[part] = {}
-                    d = d[part]
-                else:
-                    d[part] = value
+            for part in parts[:-1]:
+                nxt = d.setdefault(part, {})
+                if type(nxt) is not dict:
+                    nxt = {}
+                    d[part] = nxt
+                d = nxt
+            d[parts[-1]] = value
         # If everything is under a "data" key, output with that root.
-        if "data" in result and isinstance(result["data"], dict):
+        if "data" in result and type(result["data"]) is dict:
             return {"data": result["data"]}
-        else:
-            return result
+        return result
 
     @staticmethod
     def _flatten_dict(d: dict, parent_key: str = '', sep: str = '.') -> dict:
         """
         Flattens a nested dict to a dict with dot.notation keys.
+
+        Iterative stack walk writing into a single output dict — avoids the
+        per-level recursion and intermediate dict allocations.
         """
-        items = []
-        for k, v in d.items():
-            new_key = f"{parent_key}{sep}{k}" if parent_key else k
-            if isinstance(v, dict):
-                items.extend(WordSubmissionHandler._flatten_dict(v, new_key, sep=sep).items())
-            else:
-                items.append((new_key, v))
-        return dict(items)
+        out = {}
+        stack = [(parent_key, d)]
+        while stack:
+            prefix, cur = stack.pop()
+            for k, v in cur.items():
+                new_key = f"{prefix}{sep}{k}" if prefix else k
+                if type(v) is dict:
+                    stack.append((new_key, v))
+                else:
+                    out[new_key] = v
+        return out
 
     def load_template(self) -> None:
         """
@@ -123,8 +238,18 @@ class WordSubmissionHandler:
         if not os.path.isfile(self.template_path):
             raise FileNotFoundError(f"Template file not found: {self.template_path}")
         try:
-            self.doc = Document(self.template_path)
-            self.tpl = DocxTemplate(self.template_path)
+            key = (self.template_path, os.path.getmtime(self.template_path))
+            cached = _TPL_CACHE.get(key)
+            if cached is None:
+                cached = DocxTemplate(self.template_path)
+                if hasattr(cached, "init_docx"):
+                    cached.init_docx()
+                _TPL_CACHE[key] = cached
+                logger.debug(f"Template compiled and cached: {key}")
+            # render() mutates the template in place, so hand out a deep copy
+            # of the cached instance; still far cheaper than re-parsing the ZIP.
+            self.tpl = copy.deepcopy(cached)
+            self._template_vars = None
             self._send_status("Template loaded successfully.")
         except Exception as e:
             logger.exception("Error loading template.")
@@ -136,7 +261,11 @@ class WordSubmissionHandler:
         """
         self._send_status("==== [DEBUG] Analyzing template/context ====")
         tpl = self.tpl
-        template_vars = tpl.get_undeclared_template_variables()
+        # get_undeclared_template_variables re-parses the template each call;
+        # cache the result per loaded template.
+        template_vars = self._template_vars
+        if template_vars is None:
+            template_vars = self._template_vars = tpl.get_undeclared_template_variables()
         self._send_status(f"Template expects variables: {sorted(template_vars)}")
 
         flat_context = self._flatten_dict(context)
@@ -162,14 +291,6 @@ class WordSubmissionHandler:
         self._send_status(f"Unused in template: {sorted(unused_in_template)}")
         self._send_status(f"Used and present: {sorted(used_and_present)}")
 
-        print("\n=== TEMPLATE/CONTEXT ANALYSIS ===")
-        print("Template expects variables:", sorted(template_vars))
-        print("Context provides keys:", sorted(context_keys))
-        print("Missing in context:", sorted(missing_in_context))
-        print("Unused in template:", sorted(unused_in_template))
-        print("Used and present:", sorted(used_and_present))
-        print("====================\n")
-
         return {
             'missing_in_context': missing_in_context,
             'unused_in_template': unused_in_template,
@@ -182,48 +303,50 @@ class WordSubmissionHandler:
         Extremely verbose debug: logs context structure, types, template file checks, exceptions, and output .docx bytes.
         Also analyzes template/context variable matching.
         """
-        import pprint
         import traceback
-        import zipfile
-
-        self._send_status("==== [DEBUG] Starting render_template ====")
 
-        # 1. Log template file path and initial bytes
-        self._send_status(f"Template path: {self.template_path}")
-        try:
-            with open(self.template_path, "rb") as f:
-                bytes_head = f.read(200)
-                self._send_status(f"First 200 bytes of template file: {bytes_head!r}")
-        except Exception as e:
-            self._send_status(f"ERROR reading template file: {e}")
-
-        # 2. Log context structure and type of every value (deep)
-        self._send_status("==== [DEBUG] Context Structure ====")
-        self._send_status(pprint.pformat(context, indent=2, width=120))
-
-        def check_types(obj, prefix=""):
-            if isinstance(obj, dict):
-                for k, v in obj.items():
-                    check_types(v, f"{prefix}.{k}" if prefix else k)
-            elif isinstance(obj, list):
-                for i, v in enumerate(obj):
-                    check_types(v, f"{prefix}[{i}]")
-            else:
-                self._send_status(f"Type at {prefix}: {type(obj).__name__} | Value: {repr(obj)[:120]}")
-        check_types(context)
-
-        # 3. OEE formatting as before
-        for key, value in context.items():
-            if "oee" in key.lower() and isinstance(value, (int, float)):
-                context[key] = f"{value}%"
-
-        # --- ANALYZE TEMPLATE/CONTEXT VARIABLES ---
-        try:
-            if self.tpl is None:
-                raise ValueError("Template not loaded. Call load_template() first.")
-            self.analyze_template_and_context(context)
-        except Exception as e:
-            self._send_status(f"ERROR during template/context analysis: {e}")
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        self._send_status("Starting render_template...")
+
+        # 1/2. Deep diagnostics (file peek, context dump, per-leaf type walk)
+        # are O(context) work and only run when DEBUG logging is active.
+        if debug_enabled:
+            logger.debug(f"Template path: {self.template_path}")
+            try:
+                with open(self.template_path, "rb") as f:
+                    logger.debug(f"First 200 bytes of template file: {f.read(200)!r}")
+            except Exception as e:
+                logger.debug(f"ERROR reading template file: {e}")
+
+            logger.debug("==== [DEBUG] Context Structure ====")
+            logger.debug("%s", _LazyPformat(context))
+
+            def check_types(obj, prefix=""):
+                if isinstance(obj, dict):
+                    for k, v in obj.items():
+                        check_types(v, f"{prefix}.{k}" if prefix else k)
+                elif isinstance(obj, list):
+                    for i, v in enumerate(obj):
+                        check_types(v, f"{prefix}[{i}]")
+                else:
+                    logger.debug(f"Type at {prefix}: {type(obj).__name__} | Value: {repr(obj)[:120]}")
+            check_types(context)
+
+        # 3. OEE formatting: collect matching keys first so the dict is not
+        # mutated mid-iteration and only OEE keys pay for string formatting.
+        oee_keys = [k for k, v in context.items()
+                    if isinstance(v, (int, float)) and 'oee' in k.lower()]
+        for k in oee_keys:
+            context[k] = f"{context[k]}%"
+
+        # --- ANALYZE TEMPLATE/CONTEXT VARIABLES (diagnostic only) ---
+        if self.tpl is None:
+            raise ValueError("Template not loaded. Call load_template() first.")
+        if debug_enabled:
+            try:
+                self.analyze_template_and_context(context)
+            except Exception as e:
+                self._send_status(f"ERROR during template/context analysis: {e}")
 
         # 4. Flatten repeatable fields just before rendering
         try:
@@ -234,7 +357,10 @@ class WordSubmissionHandler:
                 flatten_jinja_repeatables(context, REPEATABLE_FIELDS)
 
             self._send_status("==== [DEBUG] Calling tpl.render(context) ====")
-            self.tpl.render(context)
+            self.tpl.render(context, jinja_env=_get_jinja_env())
+            # Flatten once here so later lookups (image markers) are O(1)
+            # dict gets instead of per-key tree traversals.
+            self._flat_ctx = self._flatten_dict(context)
             self._send_status("tpl.render completed successfully.")
         except Exception as e:
             self._send_status("==== [DEBUG] Exception during tpl.render! ====")
@@ -242,31 +368,37 @@ class WordSubmissionHandler:
             self._send_status(traceback.format_exc())
             raise
 
-        # 5. Save to temp file and log file info
+        # 5. Hand the rendered docx to python-docx through memory — no disk
+        # round-trip. A temp-file copy is only written for DEBUG inspection.
         try:
-            temp_file = os.path.join(tempfile.gettempdir(), "temp_rendered.docx")
-            self.tpl.save(temp_file)
-            self._send_status(f"==== [DEBUG] tpl.save() complete. Rendered .docx at: {temp_file}")
-            file_size = os.path.getsize(temp_file)
-            self._send_status(f"Rendered .docx size: {file_size} bytes")
-            with open(temp_file, "rb") as f:
-                file_head = f.read(200)
-                self._send_status(f"First 200 bytes of rendered .docx: {file_head!r}")
-
-            # 6. List zip (docx) contents and head of document.xml
-            with zipfile.ZipFile(temp_file, 'r') as z:
-                file_list = z.namelist()
-                self._send_status(f"Files in rendered .docx: {file_list}")
-                if "word/document.xml" in file_list:
-                    xml_bytes = z.read("word/document.xml")[:500]
-                    self._send_status("First 500 bytes of word/document.xml:\n" +
-                                      xml_bytes.decode("utf-8", errors="replace"))
-                else:
-                    self._send_status("word/document.xml not found in docx!")
-
-            # 7. Reload with python-docx as before
-            self.doc = Document(temp_file)
-            self._send_status("==== [DEBUG] Finished render_template, temp_rendered.docx loaded successfully ====")
+            buf = BytesIO()
+            self.tpl.save(buf)
+            file_size = buf.tell()
+            buf.seek(0)
+
+            if debug_enabled:
+                import zipfile
+                temp_file = os.path.join(tempfile.gettempdir(), "temp_rendered.docx")
+                with open(temp_file, "wb") as f:
+                    f.write(buf.getvalue())
+                logger.debug(f"tpl.save() complete. Rendered .docx at: {temp_file}")
+                with open(temp_file, "rb") as f:
+                    logger.debug(f"First 200 bytes of rendered .docx: {f.read(200)!r}")
+
+                # 6. List zip (docx) contents and head of document.xml
+                with zipfile.ZipFile(temp_file, 'r') as z:
+                    file_list = z.namelist()
+                    logger.debug(f"Files in rendered .docx: {file_list}")
+                    if "word/document.xml" in file_list:
+                        xml_bytes = z.read("word/document.xml")[:500]
+                        logger.debug("First 500 bytes of word/document.xml:\n" +
+                                     xml_bytes.decode("utf-8", errors="replace"))
+                    else:
+                        logger.debug("word/document.xml not found in docx!")
+
+            # 7. Reload with python-docx straight from the in-memory buffer
+            self.doc = Document(buf)
+            self._send_status(f"Render complete, {file_size} bytes.")
 
         except Exception as e:
             self._send_status("==== [DEBUG] Exception after tpl.save or while reading docx! ====")
@@ -279,26 +411,55 @@ class WordSubmissionHandler:
         Replace image markers of form [[ Image: key ]] with actual images.
         """
         self._send_status("Replacing image markers...")
-        image_marker_pattern = re.compile(r"\[\[\s*[Ii]mage:?\s*([^\]]+)\s*\]\]")
         try:
             if self.doc is None:
                 raise ValueError("Document not loaded. Call load_template() first.")
+            isfile_cache: dict = {}
+            # Dedupe disk reads: logos/diagrams are typically referenced by
+            # many markers, so read each file once and feed BytesIO copies.
+            img_cache: dict = {}
+
+            def _bytes(path: str) -> bytes:
+                b = img_cache.get(path)
+                if b is None:
+                    with open(path, 'rb') as f:
+                        b = f.read()
+                    img_cache[path] = b
+                return b
+
             for paragraph in self.doc.paragraphs:
-                matches = image_marker_pattern.findall(paragraph.text)
+                txt = paragraph.text
+                # Cheap prefilter: most paragraphs contain no marker at all.
+                if '[[' not in txt:
+                    continue
+                matches = _IMAGE_RE.findall(txt)
+                if not matches:
+                    continue
+                # Strip every marker in one pass so paragraph.text (which
+                # rewrites all runs) is assigned at most once per paragraph.
+                new_txt = _IMAGE_RE.sub('', txt)
+                if new_txt != txt:
+                    paragraph.text = new_txt
                 for match in matches:
                     image_key = match.strip()
-                    image_path = self._get_nested_context_value(context, image_key)
+                    if self._flat_ctx is not None:
+                        image_path = self._flat_ctx.get(image_key)
+                    else:
+                        # Fallback when render_template has not run yet.
+                        image_path = self._get_nested_context_value(context, image_key)
                     if not image_path:
                         logger.error(f"No image path found for key: {image_key}")
                         continue
-                    if not os.path.isfile(image_path):
+                    exists = isfile_cache.get(image_path)
+                    if exists is None:
+                        exists = os.path.isfile(image_path)
+                        isfile_cache[image_path] = exists
+                    if not exists:
                         logger.error(f"Image file not found: {image_path}")
                         continue
-                    # Remove marker text and insert picture
-                    marker_text = f"[[ Image: {image_key} ]]"
-                    paragraph.text = paragraph.text.replace(marker_text, "")
                     run = paragraph.add_run()
-                    run.add_picture(image_path, width=Mm(image_width_mm))
+                    w_emu, h_emu = _image_dims(image_path, image_width_mm)
+                    run.add_picture(BytesIO(_bytes(image_path)), width=w_emu, height=h_emu)
                     logger.info(f"Inserted image for key '{image_key}' from path: {image_path}")
             self._send_status("Image markers replaced successfully.")
         except Exception as e:
@@ -318,33 +479,61 @@ class WordSubmissionHandler:
                 return None
         return value
 
-    def insert_page_breaks(self, file_path: str) -> None:
+    def insert_page_breaks(self, file_path, word_session: Optional[WordComSession] = None) -> None:
         """
         Insert page breaks before headings via Word COM automation.
+
+        Accepts a single path or a list of paths; the Word process is launched
+        once for the whole batch. Callers doing repeated batches can pass an
+        already-entered WordComSession to reuse the running Word instance.
         """
         self._send_status("Inserting page breaks...")
+        paths = [file_path] if isinstance(file_path, str) else list(file_path)
         try:
-            pythoncom.CoInitialize()
-            word = win32.gencache.EnsureDispatch('Word.Application')
-            word.Visible = False
-            doc = word.Documents.Open(file_path)
-            page_setup = doc.PageSetup
-            page_height = page_setup.PageHeight
-            bottom_threshold = page_height * 0.75  # Bottom 25% threshold
-
-            # For demonstration, iterate over paragraphs and insert a page break before each heading.
-            for paragraph in doc.Paragraphs:
-                style_name = paragraph.Style.NameLocal
-                if "Heading" in style_name:
-                    paragraph.Range.InsertBreak(Type=win32.constants.wdPageBreak)
-            doc.Save()
-            doc.Close()
-            word.Quit()
+            if word_session is not None:
+                for path in paths:
+                    self._insert_page_breaks_in_doc(word_session.word, path)
+            else:
+                with WordComSession() as session:
+                    for path in paths:
+                        self._insert_page_breaks_in_doc(session.word, path)
             self._send_status("Page breaks inserted successfully.")
         except Exception as e:
             logger.exception("Error inserting page breaks.")
             raise e
 
+    def _insert_page_breaks_in_doc(self, word, file_path: str) -> None:
+        """
+        Open one document in the given Word instance and break before headings.
+
+        Headings are located with a single Range.Find pass per heading level,
+        so COM marshalling cost is O(headings) instead of the three
+        cross-process calls per paragraph that iterating doc.Paragraphs and
+        reading paragraph.Style.NameLocal incurs.
+        """
+        import win32com.client as win32
+        doc = word.Documents.Open(file_path)
+        try:
+            for lvl in range(1, 10):
+                try:
+                    style = doc.Styles(f"Heading {lvl}")
+                except Exception:
+                    continue  # style not defined in this document
+                rng = doc.Content
+                find = rng.Find
+                find.ClearFormatting()
+                find.Style = style
+                find.Text = ""
+                find.Forward = True
+                find.Wrap = win32.constants.wdFindStop
+                while find.Execute():
+                    rng.Collapse(win32.constants.wdCollapseStart)
+                    rng.InsertBreak(Type=win32.constants.wdPageBreak)
+                    rng.Move(Unit=win32.constants.wdParagraph, Count=1)
+            doc.Save()
+        finally:
+            doc.Close()
+
     def save_document(self, output_path: str) -> None:
         """
         Save the final document to disk.
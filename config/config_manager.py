@@ -3,11 +3,29 @@
 
 from __future__ import annotations
 import os, json, logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any
 from config.settings import Settings
 
 
+# Set once the root logger has been configured; repeated ConfigManager
+# constructions then skip handler setup (and the mkdir in get_log_path).
+_LOG_CONFIGURED = False
+
+
+@lru_cache(maxsize=8)
+def _load_server_config(path_str: str, mtime: float) -> Dict[str, Any]:
+    """
+    Load and cache server_config.json keyed by (path, mtime).
+
+    Several components construct their own ConfigManager; the cache lets all
+    of them share one disk read + JSON parse until the file actually changes.
+    """
+    with open(path_str, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
 class ConfigManager:
     """
     Manages application configuration including server and local database settings.
@@ -24,15 +42,33 @@ class ConfigManager:
     # Logging helpers (unchanged)
     # ------------------------------------------------------------------
     def setup_logging(self) -> None:
+        global _LOG_CONFIGURED
         try:
+            self.logger: logging.Logger = logging.getLogger(__name__)
+            if _LOG_CONFIGURED:
+                return
+            root_logger = logging.getLogger()
+            if root_logger.handlers:
+                # Root is already configured (main.setup_logging's queue
+                # pipeline in-app); adding a second sink here would write
+                # every record twice. Mirrors basicConfig's no-op rule.
+                _LOG_CONFIGURED = True
+                return
+            from logging.handlers import RotatingFileHandler
             log_path: Path = self.get_log_path()
             log_file: Path = log_path / "config.log"
-            logging.basicConfig(
-                level=logging.INFO,
-                format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-                filename=str(log_file)
+            file_handler = RotatingFileHandler(
+                str(log_file),
+                maxBytes=Settings.LOGGING.get("max_size", 1 << 20),
+                backupCount=Settings.LOGGING.get("backup_count", 5),
             )
-            self.logger: logging.Logger = logging.getLogger(__name__)
+            file_handler.setFormatter(logging.Formatter(
+                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+            ))
+            root_logger.addHandler(file_handler)
+            if root_logger.level == logging.NOTSET:
+                root_logger.setLevel(logging.INFO)
+            _LOG_CONFIGURED = True
         except Exception as e:
             print(f"Error during setup_logging in ConfigManager: {e}")
             raise
@@ -52,8 +88,9 @@ class ConfigManager:
                 self.logger.info(f"Server configuration path verified: {server_config_path}")
                 server_config_file: Path = server_config_path / "server_config.json"
                 if server_config_file.exists():
-                    with open(server_config_file, "r", encoding="utf-8") as f:
-                        self.server_config = json.load(f)
+                    self.server_config = _load_server_config(
+                        str(server_config_file), server_config_file.stat().st_mtime
+                    )
                     self.logger.info(f"Server configuration loaded from {server_config_file}")
                 else:
                     self.logger.warning(f"Server configuration file not found at {server_config_file}; proceeding with defaults.")
@@ -70,12 +107,12 @@ class ConfigManager:
     @staticmethod
     def get_app_data_path() -> Path:
         """Return the current application-data root folder."""
-        return Path(Settings.LOCAL_STORAGE["root_path"])             # ★ CHANGED
+        return Settings.LOCAL_STORAGE["root_path"]
 
     @staticmethod
     def get_log_path() -> Path:
         """Return (and create) the log directory."""
-        log_path: Path = Path(Settings.LOCAL_STORAGE["log_path"])     # ★ CHANGED
+        log_path: Path = Settings.LOCAL_STORAGE["log_path"]
         log_path.mkdir(parents=True, exist_ok=True)
         return log_path
 
@@ -88,9 +125,9 @@ class ConfigManager:
     # ------------------------------------------------------------------
     def get_database_config(self, database_name: str) -> Dict[str, Any]:
         try:
-            server_host: str = Settings.SERVER_CONFIG["host"]
-            server_db_path: Path = Path(server_host) / "db" / f"{database_name}.db"
-            local_db_path: Path  = Path(Settings.LOCAL_STORAGE["db_path"]) / f"{database_name}.db"  # ★ CHANGED
+            server_host: Path = Settings.SERVER_CONFIG["host"]
+            server_db_path: Path = server_host / "db" / f"{database_name}.db"
+            local_db_path: Path  = Settings.LOCAL_STORAGE["db_path"] / f"{database_name}.db"
             return {
                 "local_path"      : str(local_db_path),
                 "server_path"     : str(server_db_path),
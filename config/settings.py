@@ -6,9 +6,13 @@
 # This file adheres to MVVM architecture principles, uses Python 3.12.9 type annotations, and includes robust logging and error handling.
 
 from __future__ import annotations
+import functools
+import logging
 import os
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
+
+logger: logging.Logger = logging.getLogger(__name__)
 
 class Settings:
     """Application settings including database, storage, and UI configurations."""
@@ -26,7 +30,6 @@ class Settings:
         "db_path"    : appPathBack / "db",
         # 'max_size': 1024 * 1024 * 100  # Optional: 100MB limit
     }
-    print("[LOCAL_STORAGE]", LOCAL_STORAGE)
 
     # ----------------------------------------------------------------------
     # NEW - user-configurable folder shortcuts
@@ -42,15 +45,6 @@ class Settings:
         "retry_attempts": 3
     }
 
-    # Shelve Files mapping (for lightweight data storage)
-    SHELVE_FILES: Dict[str, Dict[str, str]] = {
-        "contacts": {
-            "local": str(LOCAL_STORAGE["db_path"] / "contacts"),
-            "server": str(SERVER_CONFIG["host"] / "contacts"),
-            "backup": str(SERVER_CONFIG["backup_path"] / "contacts")
-        }
-    }
-
     # UI Settings
     ENTRY_WIDTH: int = 50
     PROJECT_RISKS_HEIGHT: int = 5
@@ -61,11 +55,15 @@ class Settings:
     TEMPLATE_FILENAME: str = ""
     CONTACTS_DB_FILENAME: str = "contacts.db"
 
-    # Settings Visibility
-    BROWSE_SETTINGS : List[str] = ["TEMPLATE_FILENAME", "DB_FOLDER_PATH", "LOG_FOLDER_PATH"]
-    VISIBLE_SETTINGS: List[str] = ["TEMPLATE_FILENAME", "DB_FOLDER_PATH", "LOG_FOLDER_PATH"]
+    # Settings Visibility (tuples: fixed at class definition, shared safely)
+    BROWSE_SETTINGS : Tuple[str, ...] = ("TEMPLATE_FILENAME", "DB_FOLDER_PATH", "LOG_FOLDER_PATH")
+    VISIBLE_SETTINGS: Tuple[str, ...] = ("TEMPLATE_FILENAME", "DB_FOLDER_PATH", "LOG_FOLDER_PATH")
 
     # Database Settings
+    # Apply the WAL/synchronous=NORMAL pragma set on new connections; tests
+    # that want stock SQLite durability semantics can switch this off.
+    SQLITE_FAST_PRAGMAS: bool = True
+
     DATABASES: Dict[str, Dict[str, Any]] = {
         "contacts": {
             "filename": "db/contacts.db",
@@ -104,6 +102,24 @@ class Settings:
         "backup_count": 5
     }
 
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def shelve_files(cls) -> Dict[str, Dict[str, str]]:
+        """
+        Shelve files mapping (for lightweight data storage).
+
+        Computed lazily on first access so importing this module does no
+        string/path work, and re-derived after update_storage_root so the
+        paths never go stale.
+        """
+        return {
+            "contacts": {
+                "local": str(cls.LOCAL_STORAGE["db_path"] / "contacts"),
+                "server": str(cls.SERVER_CONFIG["host"] / "contacts"),
+                "backup": str(cls.SERVER_CONFIG["backup_path"] / "contacts")
+            }
+        }
+
     @classmethod
     def initialize_paths(cls) -> None:
         """
@@ -111,10 +127,14 @@ class Settings:
         Directories include root, temp, backup, log, and db paths.
         """
         try:
-            for key in ["root_path", "temp_path", "backup_path", "log_path", "db_path"]:
-                path: Path = Path(cls.LOCAL_STORAGE[key])
+            # backup_path aliases root_path and the others share its parent;
+            # dedupe first, then create shallowest-first so parents=True only
+            # ever creates each directory once.
+            unique = {Path(cls.LOCAL_STORAGE[key])
+                      for key in ("root_path", "temp_path", "backup_path", "log_path", "db_path")}
+            for path in sorted(unique, key=lambda p: len(p.parts)):
                 path.mkdir(parents=True, exist_ok=True)
-                print("Path created/verified:", path)
+                logger.debug("Path created/verified: %s", path)
         except Exception as e:
             raise Exception(f"Failed to initialize paths: {e}")
 
@@ -138,7 +158,7 @@ class Settings:
         Returns:
             Path: The path to the local database file.
         """
-        return Path(cls.LOCAL_STORAGE["db_path"]) / f"{database_name}.db"
+        return cls.LOCAL_STORAGE["db_path"] / f"{database_name}.db"
 
     @classmethod
     def get_server_database_path(cls, database_name: str) -> Path:
@@ -151,7 +171,7 @@ class Settings:
         Returns:
             Path: The path to the server database file.
         """
-        return Path(cls.SERVER_CONFIG["host"]) / "db" / f"{database_name}.db"
+        return cls.SERVER_CONFIG["host"] / "db" / f"{database_name}.db"
 
     @classmethod
     def get_database_config(cls, database_name: str) -> dict:
@@ -166,8 +186,8 @@ class Settings:
             dict: A dictionary containing database configuration settings.
         """
         return {
-            "local_path": str(Path(cls.LOCAL_STORAGE["db_path"]) / f"{database_name}.db"),
-            "server_path": str(Path(cls.SERVER_CONFIG["host"]) / "db" / f"{database_name}.db"),
+            "local_path": str(cls.LOCAL_STORAGE["db_path"] / f"{database_name}.db"),
+            "server_path": str(cls.SERVER_CONFIG["host"] / "db" / f"{database_name}.db"),
             "pool_size": cls.DATABASES[database_name].get("pool_size", 5),
             "timeout": cls.DATABASES[database_name].get("timeout", 30),
             "backup_count": cls.DATABASES[database_name].get("backup_count", 5),
@@ -176,17 +196,17 @@ class Settings:
     @classmethod
     def get_log_path(cls) -> Path:
         """Returns the path where log files are stored."""
-        return Path(cls.LOCAL_STORAGE["log_path"])
+        return cls.LOCAL_STORAGE["log_path"]
 
     @classmethod
     def get_temp_path(cls) -> Path:
         """Returns the path for temporary files."""
-        return Path(cls.LOCAL_STORAGE["temp_path"])
+        return cls.LOCAL_STORAGE["temp_path"]
 
     @classmethod
     def get_backup_path(cls) -> Path:
         """Returns the path for backup files."""
-        return Path(cls.LOCAL_STORAGE["backup_path"])
+        return cls.LOCAL_STORAGE["backup_path"]
 
     @classmethod
     def should_auto_sync(cls, change_count: int) -> bool:
@@ -198,8 +218,10 @@ class Settings:
         return cls.SYNC_CONFIG.get("interval", 300)
 
     @classmethod
-    def get_visible_settings(cls) -> List[str]:
-        return cls.VISIBLE_SETTINGS.copy()
+    def get_visible_settings(cls) -> Tuple[str, ...]:
+        # Immutable, so it can be handed out without the defensive copy the
+        # old list version needed.
+        return cls.VISIBLE_SETTINGS
 
     # ----------------------------------------------------------------------
     # NEW – single helper to move all runtime-generated files
@@ -219,5 +241,6 @@ class Settings:
 
         cls.DB_FOLDER_PATH  = cls.LOCAL_STORAGE["db_path"]
         cls.LOG_FOLDER_PATH = cls.LOCAL_STORAGE["log_path"]
+        cls.shelve_files.cache_clear()
 
         cls.initialize_paths()
@@ -8,83 +8,272 @@ import sys
 import os
 import atexit
 import signal
+import threading
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from typing import Any
 
-import webview
+# The config/service/model stack (and webview itself) is imported inside
+# main() rather than here: module import time is pure startup latency, and
+# deferring the heavy imports gets us to webview.create_window sooner.
 
-from config.config_manager import ConfigManager
-from config.settings import Settings
-from services.database_manager import DatabaseManager
-from services.sync_service import SyncService
-from models.quote_model import QuoteModel
-from viewmodels.quote_viewmodel import QuoteViewModel
-from views.pywebview_api import PyWebViewAPI
+# Resolved once at import; main() used to abspath/join this on every launch.
+_INDEX_HTML: str = str(Path(__file__).resolve().parent / "views" / "web" / "index.html")
 
 # ========== Standalone Save File Dialog Function ==========
+# Hidden Tk root reused across dialogs; constructing a Tk interpreter costs
+# hundreds of ms, so the first dialog pays it once and later ones are instant.
+_tk_root = None
+
+
+def _destroy_tk_root() -> None:
+    global _tk_root
+    if _tk_root is not None:
+        try:
+            _tk_root.destroy()
+        finally:
+            _tk_root = None
+
+
 def browse_save_file():
     """
     Opens a native Windows save file dialog and returns the selected path.
     This is used for letting the user choose the output path for generated Word documents.
     """
-    import tkinter as tk
+    global _tk_root
     from tkinter import filedialog
 
-    # Use a hidden root window so only the dialog is shown
-    root = tk.Tk()
-    root.withdraw()
+    if _tk_root is None:
+        import tkinter as tk
+        # Use a hidden root window so only the dialog is shown
+        _tk_root = tk.Tk()
+        _tk_root.withdraw()
+        atexit.register(_destroy_tk_root)
     # Windows-specific filetypes and dialog
     file_path = filedialog.asksaveasfilename(
+        parent=_tk_root,
         title="Select file to save",
         filetypes=[("Word Documents", "*.docx"), ("All Files", "*.*")]
     )
-    root.destroy()
     return file_path
 
 # ========== Logging Setup ==========
+# Kept at module scope so shutdown handlers can drain the queue and flush the
+# file handler on fatal errors.
+_log_listener = None
+_log_file_handler = None
+
+
+def _stop_log_listener() -> None:
+    """Drain and stop the queue listener exactly once; safe to call from both
+    the atexit chain and the signal handler."""
+    global _log_listener
+    if _log_listener is not None:
+        listener, _log_listener = _log_listener, None
+        listener.stop()
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler with a 64 KiB write buffer.
+
+    The stock handler flushes after every record, so each emit is a write
+    syscall. This variant only flushes on WARNING-or-higher records and on a
+    periodic background timer, collapsing runs of INFO records into one write
+    per buffer fill.
+    """
+
+    _FLUSH_INTERVAL = 30.0  # seconds
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._suppress_flush = False
+        self._flush_timer = None
+        self._schedule_flush()
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=65536,
+                    encoding=self.encoding or "utf-8")
+
+    def emit(self, record) -> None:
+        self._suppress_flush = record.levelno < logging.WARNING
+        try:
+            super().emit(record)
+        finally:
+            self._suppress_flush = False
+
+    def flush(self) -> None:
+        if self._suppress_flush:
+            return
+        super().flush()
+
+    def _schedule_flush(self) -> None:
+        self._flush_timer = threading.Timer(self._FLUSH_INTERVAL, self._timed_flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _timed_flush(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            pass
+        self._schedule_flush()
+
+    def close(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        super().close()
+
+
 def setup_logging() -> None:
     """
     Sets up robust logging for the application.
-    Logs are written to both the console and a rotating log file.
+    Logs are written to both the console and a rotating log file, routed
+    through a QueueHandler/QueueListener pair so emitting a record on the
+    request path is a queue.put instead of a blocking stat+write+flush.
     """
+    global _log_listener, _log_file_handler
     try:
+        from config.settings import Settings
+
         log_path: Path = Settings.LOCAL_STORAGE["log_path"]
         log_path.mkdir(parents=True, exist_ok=True)
-        from logging.handlers import RotatingFileHandler
-        file_handler = RotatingFileHandler(
+        import queue
+        from logging.handlers import QueueHandler, QueueListener
+        file_handler = BufferedRotatingFileHandler(
             str(log_path / "quote_generator.log"), maxBytes=5 * 1024 * 1024, backupCount=5
         )
         formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
         file_handler.setFormatter(formatter)
-        # Configure the root logger with both file and console handlers.
-        logging.basicConfig(level=logging.INFO, handlers=[file_handler, logging.StreamHandler()])
+        _log_file_handler = file_handler
+        # Caller threads only enqueue records; the listener thread does the
+        # actual file/console I/O.
+        log_queue: queue.Queue = queue.Queue(-1)
+        _log_listener = QueueListener(
+            log_queue, file_handler, logging.StreamHandler(), respect_handler_level=True
+        )
+        logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)])
+        _log_listener.start()
+        # LIFO: the listener drains the queue first, then logging.shutdown
+        # flushes and closes the handlers it fed.
+        atexit.register(logging.shutdown)
+        atexit.register(_stop_log_listener)
         logging.info("Logging configured successfully.")
     except Exception as e:
         print(f"Failed to setup logging: {e}")
         sys.exit(1)
 
+# ========== WebView Prewarm ==========
+def _prewarm_webview() -> None:
+    """
+    Import pywebview and initialize its GUI backend off the main thread.
+
+    The WebView2/Chromium runtime takes hundreds of ms to spin up cold; doing
+    it here lets that overlap the config/database/sync bring-up in main()
+    instead of serializing behind it.
+    """
+    try:
+        import webview
+        webview.initialize()
+    except Exception:
+        # Non-fatal: webview.start() on the main thread will initialize
+        # normally (just without the overlap).
+        logging.debug("webview prewarm failed", exc_info=True)
+
+
+# ========== Headless Mode ==========
+def _run_headless(api: Any) -> None:
+    """
+    Serve the PyWebViewAPI surface as JSON-lines RPC over stdin/stdout.
+
+    Each request line is {"method": name, "params": [...]}; the reply is
+    {"result": ...} or {"error": msg}. Lets batch quote generation and smoke
+    tests drive the viewmodel without paying the WebView cold start.
+    """
+    import json
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+            method = getattr(api, request["method"])
+            result = method(*request.get("params", []))
+            print(json.dumps({"result": result}), flush=True)
+        except Exception as e:
+            logging.error(f"Headless RPC error: {e}", exc_info=True)
+            print(json.dumps({"error": str(e)}), flush=True)
+
+
 # ========== Shutdown Handler ==========
-def register_shutdown_handler(sync_service: SyncService) -> None:
+def register_shutdown_handler(sync_service: "SyncService") -> None:
     """
     Registers shutdown handlers to gracefully stop background services.
+
+    Must be called on the main thread before the sync thread starts: Windows
+    only allows signal handlers to be installed from the main thread, and
+    registering first guarantees the handler exists for the thread's lifetime.
     """
+    # Low-overhead crash traces for faults in the sync thread.
+    import faulthandler
+    faulthandler.enable()
+
     def handle_shutdown(sig: Any, frame: Any) -> None:
         logging.info("Shutdown signal received. Stopping background services...")
         try:
-            sync_service.stop_sync_thread()
+            sync_service.stop_sync_thread(timeout=2.0)
         except Exception as ex:
             logging.error(f"Error during shutdown: {ex}", exc_info=True)
-        sys.exit(0)
+        # Drain the log queue ourselves, then skip the (potentially slow)
+        # atexit chain entirely — sys.exit from a signal handler can deadlock
+        # on a second flush of the same handlers.
+        try:
+            _stop_log_listener()
+        except Exception:
+            pass
+        # os._exit bypasses atexit/logging.shutdown, so push the buffered
+        # file handler's last 64 KiB out explicitly.
+        try:
+            if _log_file_handler is not None:
+                _log_file_handler.flush()
+        except Exception:
+            pass
+        os._exit(0)
 
-    atexit.register(lambda: logging.info("Application cleanup completed."))
-    signal.signal(signal.SIGINT, handle_shutdown)
-    signal.signal(signal.SIGTERM, handle_shutdown)
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGINT, handle_shutdown)
+        signal.signal(signal.SIGTERM, handle_shutdown)
 
 # ========== Main Application Entry ==========
 def main() -> None:
+    import argparse
+    parser = argparse.ArgumentParser(description="Quote Generator")
+    parser.add_argument(
+        "--headless", action="store_true",
+        help="skip the webview UI and serve JSON-lines RPC on stdin/stdout"
+    )
+    cli_args = parser.parse_args()
+
     setup_logging()
     logging.info("Starting Quote Generator Application.")
 
+    # Warm the webview runtime while the Python side initializes; perceived
+    # startup becomes max(webview_cold, python_init) rather than their sum.
+    prewarm_thread = None
+    if not cli_args.headless:
+        prewarm_thread = threading.Thread(target=_prewarm_webview, daemon=True)
+        prewarm_thread.start()
+
+    # Deferred imports (see note at top of file).
+    from config.config_manager import ConfigManager
+    from config.settings import Settings
+    from services.database_manager import DatabaseManager
+    from services.sync_service import SyncService
+    from models.quote_model import QuoteModel
+    from viewmodels.quote_viewmodel import QuoteViewModel
+    from views.pywebview_api import PyWebViewAPI
+
     # Initialize application paths and directories.
     Settings.initialize_paths()
 
@@ -101,9 +290,9 @@ def main() -> None:
     # Expose the backend API to the web view.
     api: PyWebViewAPI = PyWebViewAPI(viewmodel)
 
-    # After config_manager & db_manager exist, update runtime settings from database
-    for key in Settings.get_visible_settings():
-        val = db_manager.get_setting(key)
+    # After config_manager & db_manager exist, update runtime settings from
+    # the database — one bulk SELECT instead of a query per setting.
+    for key, val in db_manager.get_settings_bulk(Settings.get_visible_settings()).items():
         if val is not None:
             setattr(Settings, key, val)
 
@@ -117,12 +306,16 @@ def main() -> None:
         logging.error(f"Error starting sync service: {e}", exc_info=True)
         sys.exit(1)
 
-    # Determine the path to index.html (assumed to be in views/web/)
-    current_dir: str = os.path.dirname(os.path.abspath(__file__))
-    index_html: str = os.path.join(current_dir, "views", "web", "index.html")
+    # Headless runs drive the API over stdio and never touch webview/tkinter.
+    if cli_args.headless:
+        logging.info("Headless mode: serving JSON-lines RPC on stdio.")
+        _run_headless(api)
+        return
 
-    # Create and display the PyWebView window.
-    window = webview.create_window("Quote Generator", url=index_html, js_api=api)
+    # Create and display the PyWebView window (index.html lives in views/web/).
+    prewarm_thread.join()
+    import webview
+    window = webview.create_window("Quote Generator", url=_INDEX_HTML, js_api=api)
     api._window = window
 
     # ========== EXPOSE ANY STANDALONE FUNCTIONS HERE ==========
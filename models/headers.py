@@ -1,7 +1,55 @@
 # headers.py
 
-# Define the header data with labels for each category
-header_data = {
+import functools
+import json
+from pathlib import Path
+from sys import intern
+from types import MappingProxyType
+
+try:  # optional fast JSON parser; stdlib json is the fallback
+    import orjson as _fastjson
+except ImportError:
+    _fastjson = None
+
+
+__all__ = [
+    "header_data", "key_data",
+    "budgetary_categories", "final_categories", "all_categories_order",
+    "optional_categories", "incoterms_list", "weeks_after_po_options",
+    "categories_with_add_button", "spellcheck_categories",
+    "SPELLCHECK_CATEGORIES", "file_browse_fields",
+    "BUDGETARY_CATEGORIES", "FINAL_CATEGORIES", "OPTIONAL_CATEGORIES",
+    "CATEGORIES_WITH_ADD_BUTTON", "SPELLCHECK_CATEGORIES_SET",
+    "FILE_BROWSE_KEYS", "LABEL_TO_CATEGORY", "KEY_TO_CATEGORY",
+    "KEY_INFO", "lookup", "HEADERS_PAYLOAD",
+]
+
+
+def _interned(data):
+    """Intern every category/label string so the hot dict lookups and
+    membership tests below hash interned keys by identity; inner sequences
+    come back as tuples since nothing may mutate this schema."""
+    return {intern(k): tuple(intern(x) for x in v) for k, v in data.items()}
+
+
+def _load_sidecar():
+    """Read the pre-built models/headers.json (written by
+    tools/build_headers_json.py). Returns None when the sidecar is absent or
+    unreadable so a fresh checkout still works off the literals below."""
+    try:
+        raw = Path(__file__).with_suffix(".json").read_bytes()
+        return _fastjson.loads(raw) if _fastjson is not None else json.loads(raw)
+    except Exception:
+        return None
+
+
+_raw = _load_sidecar()
+
+# Define the header data with labels for each category.
+# The dict literals are the source of truth; regenerate the sidecar with
+# tools/build_headers_json.py after editing them. When the sidecar loads,
+# the literals short-circuit away and are never evaluated.
+header_data = _raw["header_data"] if _raw else {
     "Quote Information": [
         "Quote Number",
         "Quote Due Date"
@@ -78,20 +126,10 @@ header_data = {
         "Shipping Terms"
     ]
 }
-
-
-
-SPELLCHECK_CATEGORIES = [
-    "System Name",
-    "System Description",
-    "Zone Functions",
-    "System Options",
-    "Project Risks",
-    "Customer Parts Due"
-]
+header_data = _interned(header_data)
 
 # Define the key data with corresponding keys for each label
-key_data = {
+key_data = _raw["key_data"] if _raw else {
     "Quote Information": [
         "data.quoteNumber",
         "data.proposalDate"
@@ -166,6 +204,8 @@ key_data = {
     ]
 
 }
+key_data = _interned(key_data)
+del _raw
 
 # Define which categories are visible for each quote type
 budgetary_categories = [
@@ -220,7 +260,7 @@ optional_categories = [
 ]
 
 # Define standard Incoterms
-incoterms_list = [
+incoterms_list = tuple(intern(x) for x in (
     "EXW - Ex Works",
     "FCA - Free Carrier",
     "FAS - Free Alongside Ship",
@@ -232,10 +272,17 @@ incoterms_list = [
     "DAP - Delivered at Place",
     "DPU - Delivered at Place Unloaded",
     "DDP - Delivered Duty Paid"
-]
+))
+
+
+@functools.lru_cache(maxsize=1)
+def _weeks() -> tuple:
+    """Build the "Weeks after PO" options exactly once; every consumer shares
+    the same tuple of interned strings."""
+    return tuple(intern(f"Week {i}") for i in range(75))
+
 
-# Define options for "Weeks after PO", from 0 to 52
-weeks_after_po_options = [f"Week {i}" for i in range(0, 75)]  # 0 to 75 weeks
+weeks_after_po_options = _weeks()  # "Week 0" .. "Week 74"
 
 categories_with_add_button = [
     "Customer Specifications",
@@ -250,9 +297,57 @@ spellcheck_categories = [
     "System Description",
     "Zone Functions",
     "System Options",
-    "Project Risks"
+    "Project Risks",
+    "Customer Parts Due"
 ]
 
+# Intern the category lists too (so their elements share the interned key
+# objects above and `category in ...` compares pointers before characters)
+# and freeze them into tuples — ordering still matters, mutation never does.
+budgetary_categories = tuple(intern(x) for x in budgetary_categories)
+final_categories = tuple(intern(x) for x in final_categories)
+all_categories_order = tuple(intern(x) for x in all_categories_order)
+optional_categories = tuple(intern(x) for x in optional_categories)
+categories_with_add_button = tuple(intern(x) for x in categories_with_add_button)
+spellcheck_categories = tuple(intern(x) for x in spellcheck_categories)
+
+# Legacy alias: there used to be a second, slightly different list under this
+# name; spellcheck_categories above is now the single source of truth.
+SPELLCHECK_CATEGORIES = spellcheck_categories
+
+
+# ---------------------------------------------------------------------------
+# Read-only views and precomputed lookups.
+# The dicts above are static schema data consulted on hot UI paths; freezing
+# them guards against accidental mutation, and the derived sets/maps give O(1)
+# membership and reverse lookups instead of list scans.
+# ---------------------------------------------------------------------------
+header_data = MappingProxyType(header_data)
+key_data = MappingProxyType(key_data)
+
+BUDGETARY_CATEGORIES = frozenset(budgetary_categories)
+FINAL_CATEGORIES = frozenset(final_categories)
+OPTIONAL_CATEGORIES = frozenset(optional_categories)
+CATEGORIES_WITH_ADD_BUTTON = frozenset(categories_with_add_button)
+SPELLCHECK_CATEGORIES_SET = frozenset(spellcheck_categories)
+
+# label -> category and dotted key -> category reverse maps
+LABEL_TO_CATEGORY = {lbl: cat for cat, lbls in header_data.items() for lbl in lbls}
+KEY_TO_CATEGORY = {k: cat for cat, ks in key_data.items() for k in ks}
+
+# dotted key -> (category, display label, position) in one dict.get; some
+# categories have more keys than labels, in which case the key stands in.
+KEY_INFO = {}
+for _cat, _keys in key_data.items():
+    _labels = header_data.get(_cat, ())
+    for _i, _key in enumerate(_keys):
+        KEY_INFO[_key] = (_cat, _labels[_i] if _i < len(_labels) else _key, _i)
+del _cat, _keys, _labels, _i, _key
+
+
+def lookup(key):
+    """Return (category, label, index) for a dotted key, or None."""
+    return KEY_INFO.get(key)
 
 file_browse_fields = {
     "System Layout": ["data.systemLayout.elevation", "data.systemLayout.end", "data.systemLayout.iso", "data.systemLayout.top","data.systemLayout.title"],
@@ -260,4 +355,23 @@ file_browse_fields = {
     "Cost Sheet": ["data.costSheet.link"],
     "Previous Projects": ["data.previousProject.quote"],
     "Customer Specifications": ["data.customerSpecifications.cr"],
-}
\ No newline at end of file
+}
+
+FILE_BROWSE_KEYS = frozenset(k for v in file_browse_fields.values() for k in v)
+
+# Pre-serialized header metadata for the PyWebView bridge. The front end
+# fetches this one cached string and parses it once, instead of the API
+# re-serializing the nested dicts on every request.
+HEADERS_PAYLOAD = json.dumps({
+    "header_data": dict(header_data),
+    "key_data": dict(key_data),
+    "budgetary": budgetary_categories,
+    "final": final_categories,
+    "all_order": all_categories_order,
+    "optional": optional_categories,
+    "incoterms": incoterms_list,
+    "weeks": weeks_after_po_options,
+    "add_button": categories_with_add_button,
+    "spellcheck": spellcheck_categories,
+    "file_browse": file_browse_fields,
+}, separators=(",", ":"))
\ No newline at end of file
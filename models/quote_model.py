@@ -4,18 +4,88 @@
 # This module stores Quote objects in a dictionary and provides XML persistence methods (load and save).
 
 from __future__ import annotations
+import functools
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, Any, Optional
 import xml.etree.ElementTree as ET
 import logging
 import re
-import xml.etree.ElementTree as ET
-from models.headers import key_data, categories_with_add_button, all_categories_order
+from xml.sax.saxutils import escape
+from models.headers import key_data, all_categories_order, CATEGORIES_WITH_ADD_BUTTON
+from utilities.util import merge_nested_dict
+
+try:  # lxml's C-backed parser when installed; stdlib ElementTree otherwise
+    from lxml import etree as LET
+    _HAVE_LXML = True
+except ImportError:
+    _HAVE_LXML = False
 # Module-level logger configuration
 logger: logging.Logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Tag-name sanitizers, compiled once. The dotted variant serves save_to_xml
+# (dots are legal mid-tag); the legacy one also strips dots.
+_SANITIZE_RE = re.compile(r"[^A-Za-z0-9_.-]")
+
+# Every byte legal in a tag; deleting them from a key's bytes leaves b"" iff
+# the key is already clean, letting the sanitizer skip the regex engine.
+_TAG_OK_BYTES = (b"abcdefghijklmnopqrstuvwxyz"
+                 b"ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.-")
+_SANITIZE_NODOT_RE = re.compile(r"[^A-Za-z0-9_-]")
+
+# ASCII translation table mapping every disallowed codepoint to "_"; the
+# regex only runs for keys containing non-ASCII characters.
+_NODOT_TRANS = str.maketrans({
+    c: "_" for c in map(chr, range(128))
+    if not (c.isalnum() or c in "_-")
+})
+
+
+# The category schema never changes at runtime, so flatten the per-save walk
+# of all_categories_order/key_data into one plan: (True, "prefix.") entries
+# for dynamic add-button bases, (False, "full.key") for static ones, in emit
+# order.
+_ORDER_PLAN = tuple(
+    (True, base.rsplit(".", 1)[0] + ".") if cat in CATEGORIES_WITH_ADD_BUTTON
+    else (False, base)
+    for cat in all_categories_order
+    for base in key_data.get(cat, ())
+)
+
+
+def _trailing_int(s: str, _rp=str.rpartition) -> int:
+    """Sort key for dynamic keys like data.customerspecifications.3."""
+    return int(_rp(s, ".")[2])
+
+
+def _flatten(d: Dict[str, Any], prefix: str = "data") -> Dict[str, str]:
+    """Flatten a nested dict into {"prefix.k1.k2": leaf} with an explicit
+    stack; non-string leaves collapse to "" as the old drill-down did."""
+    flat: Dict[str, str] = {}
+    stack = [(prefix, d)]
+    while stack:
+        pre, curr = stack.pop()
+        for k, v in curr.items():
+            full = f"{pre}.{k}"
+            if isinstance(v, dict):
+                stack.append((full, v))
+            else:
+                flat[full] = v if isinstance(v, str) else ""
+    return flat
+
+
+@functools.lru_cache(maxsize=4096)
+def _sanitize_tag(key: str) -> str:
+    """Turn a data key into a valid XML tag name; cached because the same
+    data.* keys recur on every save."""
+    if not key[:1].isdigit() and not key.encode("utf-8").translate(None, _TAG_OK_BYTES):
+        return key
+    tag = _SANITIZE_RE.sub("_", key)
+    if tag[:1].isdigit():
+        tag = f"n{tag}"
+    return tag
+
 
 @dataclass
 class Quote:
@@ -70,30 +140,22 @@ class QuoteModel:
 
     def save_to_xml(self, filename: str, quote_type: Optional[str] = None) -> None:
         try:
-            self.logger.info(f"Saving quote model data: {self.quotes}")
-            # 1) Root element
-            root = ET.Element("QuoteData")
-            if quote_type is not None:
-                type_el = ET.SubElement(root, "quoteType")
-                type_el.text = quote_type
-
-            # 2) Sanitizer for XML tag names (allows dot)
-            def _sanitize(k: str) -> str:
-                tag = re.sub(r"[^A-Za-z0-9_.-]", "_", k)
-                if tag and tag[0].isdigit():
-                    tag = f"n{tag}"
-                return tag
-
-            # 3) Collector for nested dict keys (unused if flat)
-            def _collect_keys(d: dict, prefix="data"):
-                keys = []
-                for k, v in d.items():
-                    full = f"{prefix}.{k}"
-                    if isinstance(v, dict):
-                        keys += _collect_keys(v, full)
-                    else:
-                        keys.append(full)
-                return keys
+            # %r defers the (potentially huge) repr until a handler wants it
+            self.logger.info("Saving quote model data: %r", self.quotes)
+
+            # Empty model: write the minimal document and skip the whole
+            # ordering machinery.
+            if not self.quotes:
+                with open(filename, "wb") as f:
+                    f.write(b"<?xml version='1.0' encoding='utf-8'?>\n")
+                    f.write(b"<QuoteData>\n")
+                    if quote_type is not None:
+                        f.write(b"  <quoteType>"
+                                + escape(quote_type).encode("utf-8")
+                                + b"</quoteType>\n")
+                    f.write(b"</QuoteData>\n")
+                self.logger.info("Quotes saved to XML file: %s", filename)
+                return
 
             # 4) Grab the quote_data (could be flat or nested)
             quote_data = next(iter(self.quotes.values())).data if self.quotes else {}
@@ -101,70 +163,56 @@ class QuoteModel:
             # 5) Detect flat-map scenario (keys already start with "data.")
             is_flat_map = bool(quote_data) and all(isinstance(k, str) and k.startswith("data.") for k in quote_data.keys())
 
-            # 6) Build the set of present keys
-            if is_flat_map:
-                present_keys = set(quote_data.keys())
-            else:
-                present_keys = set(_collect_keys(quote_data))
+            # 6) Flatten nested data once up front; from here on the emission
+            # loop only ever does flat dict lookups.
+            flat_data = quote_data if is_flat_map else _flatten(quote_data)
+            present_keys = set(flat_data.keys())
+
+            # 7) Order keys according to the precomputed schema plan. Group
+            # the present keys by dotted prefix in one pass first, so each
+            # dynamic base resolves with a dict lookup instead of scanning
+            # every key with startswith.
+            buckets: Dict[str, list] = {}
+            for k in present_keys:
+                buckets.setdefault(k.rsplit(".", 1)[0] + ".", []).append(k)
 
-            # 7) Order keys according to categories & key_data
             ordered_keys = []
-            for cat in all_categories_order:
-                bases = key_data.get(cat, [])
-                if cat in categories_with_add_button:
-                    # dynamic entries
-                    for base in bases:
-                        prefix = base.rsplit(".", 1)[0] + "."
-                        dyn_keys = sorted(
-                            [k for k in present_keys if k.startswith(prefix)],
-                            key=lambda x: int(x.split(".")[-1])
-                        )
-                        ordered_keys.extend(dyn_keys)
-                else:
-                    # static entries
-                    for base in bases:
-                        if base in present_keys:
-                            ordered_keys.append(base)
-
-            # 8) Emit each key as an XML element
-            for full_key in ordered_keys:
-                tag = _sanitize(full_key)
-                el = ET.SubElement(root, tag)
-
-                if is_flat_map:
-                    # Direct lookup in flat map
-                    value = quote_data.get(full_key, "")
-                else:
-                    # Drill into nested dict
-                    lookup = full_key[len("data."):]
-                    curr = quote_data
-                    for part in lookup.split("."):
-                        if isinstance(curr, dict):
-                            curr = curr.get(part)
-                        else:
-                            curr = None
-                        if curr is None:
-                            break
-                    value = curr if isinstance(curr, str) else ""
-
-                el.text = value
-
-            # 9) Write XML with indentation
-            tree = ET.ElementTree(root)
-            ET.indent(tree, space="  ")
-            with open(filename, "wb") as f:
-                tree.write(f, encoding="utf-8", xml_declaration=True)
-
-            self.logger.info(f"Quotes saved to XML file: {filename}")
+            for is_dynamic, base in _ORDER_PLAN:
+                if is_dynamic:
+                    ordered_keys.extend(sorted(buckets.get(base, ()), key=_trailing_int))
+                elif base in present_keys:
+                    ordered_keys.append(base)
+
+            # 8) Stream the document straight to a buffered byte writer —
+            # no element tree to build, indent, and walk a second time.
+            with open(filename, "wb", buffering=1 << 20) as f:
+                write = f.write
+                write(b"<?xml version='1.0' encoding='utf-8'?>\n")
+                write(b"<QuoteData>\n")
+                if quote_type is not None:
+                    write(b"  <quoteType>"
+                          + escape(quote_type).encode("utf-8")
+                          + b"</quoteType>\n")
+
+                for full_key in ordered_keys:
+                    value = flat_data.get(full_key, "")
+                    tag = _sanitize_tag(full_key).encode("utf-8")
+                    write(b"  <" + tag + b">"
+                          + escape(value).encode("utf-8")
+                          + b"</" + tag + b">\n")
+
+                write(b"</QuoteData>\n")
+
+            self.logger.info("Quotes saved to XML file: %s", filename)
 
         except Exception:
             self.logger.error("Error saving quotes to XML.", exc_info=True)
             raise
 
 
-    def _merge_data(self, d: Dict[str, Any], nested_key: str, value: Any) -> None:
-        from utilities.util import merge_nested_dict
-        merge_nested_dict(d, nested_key, value)
+    def _merge_data(self, d: Dict[str, Any], nested_key: str, value: Any,
+                    parts: list | None = None) -> None:
+        merge_nested_dict(d, nested_key, value, parts)
 
 
     def load_from_xml(self, filename: str) -> None:
@@ -182,22 +230,21 @@ class QuoteModel:
              data structure so that the view can later render all dynamic sections.
         """
         try:
-            tree = ET.parse(filename)
-            root = tree.getroot()
             loaded_quotes: Dict[int, Quote] = {}
 
             # Variable to hold the quote type, if present.
             loaded_quote_type: Optional[str] = None
 
+            # Stream the file instead of materializing the whole DOM: each
+            # element is processed on its end event and cleared, so peak
+            # memory stays O(one element) rather than O(file). lxml's C
+            # parser takes over when it's installed; the event protocol is
+            # identical.
+            _iterparse = LET.iterparse if _HAVE_LXML else ET.iterparse
+            context = _iterparse(filename, events=("start", "end"))
+            _, root = next(context)  # root's start event fires first
+
             if root.tag == "QuoteData":
-                # Look for the <quoteType> element among the children.
-                for child in root:
-                    if child.tag == "quoteType":
-                        loaded_quote_type = child.text or ""
-                        break
-
-                # Create a new Quote instance. Make sure that your Quote class has an attribute
-                # (e.g., quote_type) to store the loaded quote type.
                 quote = Quote(
                     id=0,
                     text="",
@@ -205,27 +252,31 @@ class QuoteModel:
                     created_at=datetime.now(),
                     data={}
                 )
-                if loaded_quote_type is not None:
-                    quote.quote_type = loaded_quote_type
 
-                # Iterate through the rest of the XML elements and merge dynamic fields.
-                for item in root:
-                    # Skip metadata elements.
-                    if item.tag == "quoteType":
-                        continue
-                    full_key = item.tag  # e.g. "data.quoteNumber"
-                    if not full_key.startswith("data."):
+                for event, elem in context:
+                    if event != "end" or elem is root:
                         continue
-                    value = item.text or ""
-                    nested_key = full_key[len("data."):]
-                    # Merge into the nested dict using the helper.
-                    self._merge_data(quote.data, nested_key, value)
+                    full_key = elem.tag  # e.g. "data.quoteNumber"
+                    if full_key == "quoteType":
+                        loaded_quote_type = elem.text or ""
+                    elif full_key.startswith("data."):
+                        # Split once here and hand the parts to the helper so
+                        # the bulk load doesn't re-split every key.
+                        parts = full_key.split(".")[1:]
+                        self._merge_data(quote.data, full_key[len("data."):],
+                                         elem.text or "", parts)
+                    elem.clear()
+                    root.clear()
 
+                if loaded_quote_type is not None:
+                    quote.quote_type = loaded_quote_type
                 loaded_quotes[quote.id] = quote
 
             else:
                 # Legacy format: multiple <Quote> entries under <Quotes>
-                for quote_el in root.findall("Quote"):
+                for event, quote_el in context:
+                    if event != "end" or quote_el.tag != "Quote":
+                        continue
                     try:
                         quote_id = int(quote_el.attrib.get("id", "0"))
                         text = quote_el.findtext("Text", default="")
@@ -251,13 +302,15 @@ class QuoteModel:
                         )
                     except Exception as inner_e:
                         self.logger.error(
-                            f"Error parsing <Quote id='{quote_id}'>: {inner_e}",
+                            "Error parsing <Quote>: %s", inner_e,
                             exc_info=True
                         )
+                    quote_el.clear()
+                    root.clear()
 
             self.quotes = loaded_quotes
             self.logger.info(
-                f"Loaded {len(self.quotes)} quotes from XML file: {filename}"
+                "Loaded %d quotes from XML file: %s", len(self.quotes), filename
             )
         except Exception as e:
             self.logger.error("Error loading quotes from XML.", exc_info=True)
@@ -266,8 +319,10 @@ class QuoteModel:
 
 
     def _sanitize_xml_key(self, key: str) -> str:
-        import re
-        tag = re.sub(r"[^A-Za-z0-9_-]", "_", key)
-        if tag and tag[0].isdigit():
+        if key.isascii():
+            tag = key.translate(_NODOT_TRANS)
+        else:
+            tag = _SANITIZE_NODOT_RE.sub("_", key)
+        if tag[:1].isdigit():
             tag = f"n{tag}"
         return tag
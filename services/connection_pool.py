@@ -10,17 +10,28 @@ import sqlite3
 import logging
 import time
 import threading
-import time
-from datetime import datetime, timedelta
+from collections import deque
 from pathlib import Path
-import os
-import socket
-from typing import Optional, List
+from typing import Deque, Dict, Optional, List
 from filelock import FileLock, Timeout
 
+from config.settings import Settings
+
 logger: logging.Logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Connection-init SQL, built once so pool growth doesn't rebuild the strings.
+_BUSY_TIMEOUT_SQL = "PRAGMA busy_timeout=30000;"
+_FAST_PRAGMAS_SQL = (
+    "PRAGMA journal_mode=WAL;"
+    "PRAGMA synchronous=NORMAL;"
+    "PRAGMA cache_size=-65536;"
+    "PRAGMA temp_store=MEMORY;"
+    "PRAGMA mmap_size=268435456;"
+    "PRAGMA wal_autocheckpoint=1000;"
+)
+
+
 class DatabaseConnection:
     """
     Enhanced database connection wrapper with metadata and thread-safe locking.
@@ -28,8 +39,8 @@ class DatabaseConnection:
     Attributes:
         connection (sqlite3.Connection): The SQLite connection instance.
         server_path (Path): The path to the database file.
-        created_at (datetime): Timestamp when the connection was created.
-        last_used (datetime): Timestamp when the connection was last used.
+        created_at (float): time.monotonic() timestamp when the connection was created.
+        last_used (float): time.monotonic() timestamp when the connection was last used.
         transaction_level (int): Current transaction depth.
         lock (threading.RLock): Reentrant lock for thread safety.
         in_use (bool): Flag indicating if the connection is in use.
@@ -37,8 +48,10 @@ class DatabaseConnection:
     def __init__(self, connection: sqlite3.Connection, server_path: Path) -> None:
         self.connection: sqlite3.Connection = connection
         self.server_path: Path = server_path
-        self.created_at: datetime = datetime.now()
-        self.last_used: datetime = datetime.now()
+        # Monotonic floats: only ever compared as ages, and time.monotonic()
+        # skips the datetime object construction on every acquire/release.
+        self.created_at: float = time.monotonic()
+        self.last_used: float = time.monotonic()
         self.transaction_level: int = 0
         self.lock: threading.RLock = threading.RLock()
         self.in_use: bool = False
@@ -49,14 +62,35 @@ class ConnectionPool:
     Provides thread-safe connection acquisition and release using file-based locking
     via the filelock library.
     """
-    def __init__(self, server_path: str, max_connections: int = 20, logger_obj: Optional[logging.Logger] = None) -> None:
+    def __init__(self, server_path: str, max_connections: int = 20,
+                 logger_obj: Optional[logging.Logger] = None,
+                 min_connections: int = 0) -> None:
         self.server_path: Path = Path(server_path)
+        # One FileLock reused for the pool's lifetime (filelock counts
+        # acquisitions internally), with the path stringified once.
+        self._lock_file_path: str = f"{self.server_path}.lock"
+        self._file_lock: FileLock = FileLock(self._lock_file_path)
         self.max_connections: int = max_connections
         self.connections: List[DatabaseConnection] = []
+        # Idle wrappers ready for checkout, plus an id(sqlite3.Connection)
+        # index so acquire/release are O(1) instead of scanning the pool.
+        self._idle: Deque[DatabaseConnection] = deque()
+        self._by_id: Dict[int, DatabaseConnection] = {}
         self.lock: threading.Lock = threading.Lock()
-        self.connection_semaphore: threading.BoundedSemaphore = threading.BoundedSemaphore(max_connections)
+        # Waiters block on this condition until release_connection hands a
+        # wrapper back; no semaphore bookkeeping to keep in sync with it.
+        self._cv: threading.Condition = threading.Condition(self.lock)
         self.logger: logging.Logger = logger_obj if logger_obj is not None else logger
 
+        # Pre-open connections so early callers skip the cold connect+pragma
+        # cost on their own thread.
+        for _ in range(min(min_connections, max_connections)):
+            warm = self._create_connection()
+            warm.in_use = False
+            self.connections.append(warm)
+            self._idle.append(warm)
+            self._by_id[id(warm.connection)] = warm
+
     def _acquire_server_lock(self, timeout: int = 30) -> FileLock:
         """
         Acquire a file lock using the filelock library.
@@ -70,20 +104,22 @@ class ConnectionPool:
         Raises:
             TimeoutError: If the lock cannot be acquired within the timeout period.
         """
-        lock_file: str = f"{self.server_path}.lock"
-        file_lock: FileLock = FileLock(lock_file, timeout=timeout)
         try:
-            file_lock.acquire()
-            self.logger.info(f"Acquired lock on {self.server_path} using filelock.")
-            return file_lock
+            self._file_lock.acquire(timeout=timeout)
+            self.logger.info("Acquired lock on %s using filelock.", self.server_path)
+            return self._file_lock
         except Timeout:
-            self.logger.error(f"Could not acquire lock for {self.server_path} within {timeout} seconds.")
+            self.logger.error("Could not acquire lock for %s within %s seconds.", self.server_path, timeout)
             raise TimeoutError(f"Could not acquire lock for {self.server_path} within {timeout} seconds.")
 
     def _create_connection(self) -> DatabaseConnection:
         """
-        Create a new DatabaseConnection with optimized settings, protecting the critical section
-        with a file lock acquired via the filelock library.
+        Create a new DatabaseConnection with optimized settings.
+
+        No cross-process file lock is taken here: SQLite's own locking plus
+        the 30s busy_timeout already serialize concurrent writers, so the old
+        FileLock around connect added syscalls without protecting anything.
+        _acquire_server_lock remains for callers that truly need it.
 
         Returns:
             DatabaseConnection: A newly created and configured database connection.
@@ -91,37 +127,29 @@ class ConnectionPool:
         Raises:
             Exception: Propagates any errors encountered during connection creation.
         """
-        file_lock: Optional[FileLock] = None
         try:
-            file_lock = self._acquire_server_lock(timeout=30)
             connection: sqlite3.Connection = sqlite3.connect(
                 str(self.server_path),
                 timeout=30,
                 isolation_level=None,
                 uri=True,
-                check_same_thread=False
+                check_same_thread=False,
+                cached_statements=256
             )
             connection.row_factory = sqlite3.Row
-            cursor = connection.cursor()
-            cursor.executescript("""
-                PRAGMA journal_mode=WAL;
-                PRAGMA synchronous=NORMAL;
-                PRAGMA cache_size=-2000;
-                PRAGMA temp_store=MEMORY;
-                PRAGMA mmap_size=268435456;
-                PRAGMA busy_timeout=30000;
-            """)
+            connection.executescript(_BUSY_TIMEOUT_SQL)
+            if Settings.SQLITE_FAST_PRAGMAS:
+                # WAL + NORMAL lets the sync thread write while the UI reads;
+                # the bigger page cache and capped autocheckpoint keep the
+                # startup settings reads off the journal.
+                connection.executescript(_FAST_PRAGMAS_SQL)
             db_connection = DatabaseConnection(connection, self.server_path)
             db_connection.in_use = True
-            self.logger.info(f"Created new database connection for {self.server_path}.")
+            self.logger.info("Created new database connection for %s.", self.server_path)
             return db_connection
         except Exception as e:
             self.logger.error("Error creating database connection.", exc_info=True)
             raise
-        finally:
-            if file_lock:
-                file_lock.release()
-                self.logger.info(f"Released lock on {self.server_path} after connection creation.")
 
     def get_connection(self) -> sqlite3.Connection:
         """
@@ -133,21 +161,20 @@ class ConnectionPool:
         Raises:
             Exception: If no connection is available within the semaphore timeout.
         """
-        if not self.connection_semaphore.acquire(timeout=5):
-            raise Exception("Timeout acquiring a connection from the pool.")
-        with self.lock:
-            for conn in self.connections:
-                if not conn.in_use:
-                    conn.in_use = True
-                    conn.last_used = datetime.now()
-                    self.logger.info("Reusing existing connection.")
-                    return conn.connection
-            if len(self.connections) < self.max_connections:
-                new_conn: DatabaseConnection = self._create_connection()
-                self.connections.append(new_conn)
-                return new_conn.connection
-        self.connection_semaphore.release()
-        raise Exception("No available connections in the pool.")
+        with self._cv:
+            while not self._idle and len(self.connections) >= self.max_connections:
+                if not self._cv.wait(timeout=5):
+                    raise Exception("Timeout acquiring a connection from the pool.")
+            if self._idle:
+                conn = self._idle.popleft()
+                conn.in_use = True
+                conn.last_used = time.monotonic()
+                self.logger.info("Reusing existing connection.")
+                return conn.connection
+            new_conn: DatabaseConnection = self._create_connection()
+            self.connections.append(new_conn)
+            self._by_id[id(new_conn.connection)] = new_conn
+            return new_conn.connection
 
     def release_connection(self, connection: sqlite3.Connection) -> None:
         """
@@ -156,12 +183,28 @@ class ConnectionPool:
         Args:
             connection (sqlite3.Connection): The connection to release.
         """
-        with self.lock:
-            for conn in self.connections:
-                if conn.connection == connection:
-                    conn.in_use = False
-                    conn.last_used = datetime.now()
-                    self.connection_semaphore.release()
-                    self.logger.info("Connection released back to the pool.")
-                    return
+        with self._cv:
+            conn = self._by_id.get(id(connection))
+            if conn is not None:
+                conn.in_use = False
+                conn.last_used = time.monotonic()
+                self._idle.append(conn)
+                self._cv.notify()
+                self.logger.info("Connection released back to the pool.")
+                return
         self.logger.warning("Attempted to release a connection not in the pool.")
+
+    def close_all(self) -> None:
+        """
+        Close every pooled connection and reset the pool's bookkeeping.
+        """
+        with self._cv:
+            for conn in self.connections:
+                try:
+                    conn.connection.close()
+                except Exception:
+                    self.logger.error("Error closing pooled connection.", exc_info=True)
+            self.connections.clear()
+            self._idle.clear()
+            self._by_id.clear()
+            self._cv.notify_all()
@@ -7,7 +7,7 @@ import sqlite3
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, Optional, Generator
+from typing import Dict, Any, Final, List, Optional, Generator
 from contextlib import contextmanager
 import os
 import socket
@@ -22,6 +22,73 @@ from services.connection_pool import ConnectionPool
 logger: logging.Logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# SQL statements hoisted to module constants. sqlite3's prepared-statement
+# cache keys on the statement text, so referencing one shared string per
+# statement avoids rebuilding the literal on each call and keeps every
+# caller hitting the same cached plan.
+_SQL_GET_CONTACT: Final[str] = (
+    "SELECT id, name, email, title, phone FROM contacts WHERE id = ?"
+)
+_SQL_INSERT_CONTACT: Final[str] = (
+    "INSERT INTO contacts (name, title, phone, email) VALUES (?, ?, ?, ?)"
+)
+_SQL_INSERT_CONTACT_RETURNING: Final[str] = _SQL_INSERT_CONTACT + " RETURNING id"
+# RETURNING landed in SQLite 3.35; older runtimes fall back to lastrowid.
+_HAS_RETURNING: Final[bool] = sqlite3.sqlite_version_info >= (3, 35, 0)
+_SQL_UPDATE_CONTACT: Final[str] = (
+    "UPDATE contacts SET name = ?, title = ?, phone = ?, email = ? WHERE id = ?"
+)
+_SQL_GET_SETTING: Final[str] = "SELECT value FROM settings WHERE key = ?"
+_SQL_UPSERT_SETTING: Final[str] = (
+    "INSERT INTO settings (key, value) VALUES (?, ?) "
+    "ON CONFLICT(key) DO UPDATE SET value=excluded.value"
+)
+
+# DDL per database, table-driven so new tables or indexes slot in without
+# touching the dispatch in _initialize_schema.
+_SCHEMAS: Final[Dict[str, tuple]] = {
+    "contacts": (
+        """
+        CREATE TABLE IF NOT EXISTS contacts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT NOT NULL,
+            title TEXT,
+            phone TEXT
+        );
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_contacts_email ON contacts(email);",
+    ),
+    "settings": (
+        """
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        """,
+    ),
+    "quotes": (
+        """
+        CREATE TABLE IF NOT EXISTS quotes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            quote_number TEXT,
+            customer_name TEXT,
+            created_at TEXT,
+            data TEXT
+        );
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_quotes_quote_number ON quotes(quote_number);",
+        "CREATE INDEX IF NOT EXISTS idx_quotes_created_at ON quotes(created_at DESC);",
+    ),
+}
+
+# Each database's DDL joined once into a single script, run under one
+# explicit transaction: one prepare pass and one commit per database.
+_SCHEMA_SCRIPTS: Final[Dict[str, str]] = {
+    name: "BEGIN;\n" + "\n".join(stmts) + "\nCOMMIT;"
+    for name, stmts in _SCHEMAS.items()
+}
+
 class DatabaseManager:
     """
     DatabaseManager handles all database operations including creation, schema initialization,
@@ -32,13 +99,31 @@ class DatabaseManager:
         self.config_manager: Any = config_manager
         self.sync_service: Optional[Any] = sync_service
         self.connection_pools: Dict[str, ConnectionPool] = {}
+        # Resolved path strings and config dicts, filled by
+        # initialize_databases so the utility paths stop re-resolving them.
+        self._db_paths: Dict[str, str] = {}
+        self._db_configs: Dict[str, Dict[str, Any]] = {}
+        # WAL allows many readers but only one writer; a dedicated writer
+        # connection per database, serialized by its lock, keeps pooled
+        # connections from contending on the WAL write lock.
+        self._writer_locks: Dict[str, threading.Lock] = {}
+        self._writer_connections: Dict[str, sqlite3.Connection] = {}
+        # psutil.Process objects reused across handle polls so repeat scans
+        # don't rebuild one per pid every half second.
+        self._proc_cache: Dict[int, psutil.Process] = {}
         self.logger: logging.Logger = logger
         self._connection_lock: threading.Lock = threading.Lock()
+        self._optimize_timer: Optional[threading.Timer] = None
+        self._closed: bool = False
         self.initialize_databases()
+        self._schedule_optimize()
 
     def initialize_databases(self) -> None:
         """
-        Ensure that all configured databases exist and have their schemas initialized.
+        Ensure that all configured database files exist and cache their
+        paths/configs. Connection pools (and schema DDL) are created lazily
+        on first use so callers that touch only one database never open the
+        other files.
         """
         try:
             for db_name in ["contacts", "settings", "quotes"]:
@@ -50,54 +135,66 @@ class DatabaseManager:
                 if not local_db_path.exists():
                     self.logger.info(f"Database file {local_db_path} not found. Creating new database.")
                     conn = sqlite3.connect(str(local_db_path))
+                    # Must run before any table exists; lets compaction
+                    # reclaim pages incrementally instead of a full VACUUM.
+                    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                    # WAL mode is persistent on the file, so setting it at
+                    # creation covers every later connection (pooled or raw).
+                    conn.execute("PRAGMA journal_mode=WAL")
                     conn.close()
-                # Set up connection pool
-                pool: ConnectionPool = ConnectionPool(
-                    server_path=str(local_db_path),
-                    max_connections=db_config.get("pool_size", 5)
-                )
-                self.connection_pools[db_name] = pool
-                # Initialize schema for this database
-                self._initialize_schema(db_name)
+                self._db_paths[db_name] = str(local_db_path.resolve())
+                self._db_configs[db_name] = db_config
+                self._writer_locks[db_name] = threading.Lock()
             self.logger.info("Databases initialized successfully.")
         except Exception as e:
             self.logger.error("Error initializing databases.", exc_info=True)
             raise
 
+    def _create_pool(self, db_name: str) -> ConnectionPool:
+        """
+        Create the connection pool for a database and run its schema DDL.
+        Caller must hold self._connection_lock.
+        """
+        db_config = self._db_configs[db_name]
+        pool = ConnectionPool(
+            server_path=self._db_paths[db_name],
+            max_connections=db_config.get("pool_size", 5)
+        )
+        self.connection_pools[db_name] = pool
+        self._initialize_schema(db_name)
+        return pool
+
+    # Interval for the background "PRAGMA optimize" pass; keeps SQLite's
+    # query-planner statistics fresh without blocking foreground work.
+    _OPTIMIZE_INTERVAL: float = 15 * 60.0
+
+    def _schedule_optimize(self) -> None:
+        if self._closed:
+            return
+        self._optimize_timer = threading.Timer(self._OPTIMIZE_INTERVAL, self._run_optimize)
+        self._optimize_timer.daemon = True
+        self._optimize_timer.start()
+
+    def _run_optimize(self) -> None:
+        if self._closed:
+            return
+        for db_name in list(self.connection_pools):
+            try:
+                with self.get_connection(db_name) as conn:
+                    conn.execute("PRAGMA optimize")
+            except Exception:
+                self.logger.error(f"PRAGMA optimize failed for {db_name}", exc_info=True)
+        self._schedule_optimize()
+
     def _initialize_schema(self, db_name: str) -> None:
         """
         Initialize the database schema for the specified database.
         """
         try:
             with self.get_connection(db_name) as conn:
-                if db_name == "contacts":
-                    conn.execute("""
-                        CREATE TABLE IF NOT EXISTS contacts (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            name TEXT NOT NULL,
-                            email TEXT NOT NULL,
-                            title TEXT,
-                            phone TEXT
-                        );
-                    """)
-                elif db_name == "settings":
-                    conn.execute("""
-                        CREATE TABLE IF NOT EXISTS settings (
-                            key TEXT PRIMARY KEY,
-                            value TEXT
-                        );
-                    """)
-                elif db_name == "quotes":
-                    conn.execute("""
-                        CREATE TABLE IF NOT EXISTS quotes (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            quote_number TEXT,
-                            customer_name TEXT,
-                            created_at TEXT,
-                            data TEXT
-                        );
-                    """)
-                conn.commit()
+                script = _SCHEMA_SCRIPTS.get(db_name)
+                if script:
+                    conn.executescript(script)
                 self.logger.info(f"Schema initialized for database: {db_name}")
         except Exception as e:
             self.logger.error(f"Error initializing schema for {db_name}: {e}", exc_info=True)
@@ -107,9 +204,7 @@ class DatabaseManager:
         """
         Return a direct, un-pooled connection to the contacts database.
         """
-        db_conf = self.config_manager.get_database_config("contacts")
-        db_path = Path(db_conf["local_path"])
-        return sqlite3.connect(str(db_path))
+        return sqlite3.connect(self._db_paths["contacts"])
 
     @contextmanager
     def get_connection(self, db_name: str) -> Generator[sqlite3.Connection, None, None]:
@@ -117,7 +212,13 @@ class DatabaseManager:
         Provide a context-managed connection from the pool for the specified database.
         """
         if db_name not in self.connection_pools:
-            raise ValueError(f"Unknown database: {db_name}")
+            if db_name not in self._db_paths:
+                raise ValueError(f"Unknown database: {db_name}")
+            # Double-checked: first caller builds the pool, later callers
+            # skip straight past the lock.
+            with self._connection_lock:
+                if db_name not in self.connection_pools:
+                    self._create_pool(db_name)
         pool: ConnectionPool = self.connection_pools[db_name]
         connection: sqlite3.Connection = pool.get_connection()
         try:
@@ -135,18 +236,122 @@ class DatabaseManager:
             except Exception as e:
                 self.logger.error(f"Error releasing connection for {db_name}: {e}", exc_info=True)
 
+    @contextmanager
+    def get_writer_connection(self, db_name: str) -> Generator[sqlite3.Connection, None, None]:
+        """
+        Yield the single dedicated writer connection for a database.
+
+        The per-database lock serializes writers at the Python level, so
+        statements run without ever hitting SQLITE_BUSY against another
+        pooled connection. Readers stay on the pool and never block.
+        """
+        if db_name not in self._writer_locks:
+            raise ValueError(f"Unknown database: {db_name}")
+        # Schema DDL runs with lazy pool creation, so make sure it has
+        # happened before the first write against a fresh database file.
+        if db_name not in self.connection_pools:
+            with self._connection_lock:
+                if db_name not in self.connection_pools:
+                    self._create_pool(db_name)
+        with self._writer_locks[db_name]:
+            conn = self._writer_connections.get(db_name)
+            if conn is None:
+                conn = sqlite3.connect(
+                    self._db_paths[db_name],
+                    timeout=30,
+                    isolation_level=None,
+                    check_same_thread=False,
+                    cached_statements=256
+                )
+                conn.row_factory = sqlite3.Row
+                conn.execute("PRAGMA busy_timeout=30000")
+                self._writer_connections[db_name] = conn
+            try:
+                yield conn
+            except Exception as e:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                self.logger.error(f"Error during write operation for {db_name}: {e}", exc_info=True)
+                raise
+
+    @contextmanager
+    def transaction(self, db_name: str) -> Generator[sqlite3.Connection, None, None]:
+        """
+        Context-managed connection wrapped in one explicit transaction.
+
+        Lets callers batch several statements under a single commit — one
+        WAL frame and fsync amortized over the batch instead of one each.
+        """
+        with self.get_writer_connection(db_name) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except Exception:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    def add_contacts_bulk(self, rows: List[tuple]) -> bool:
+        """
+        Insert many (name, title, phone, email) rows in one transaction.
+        """
+        if not rows:
+            return True
+        try:
+            with self.transaction("contacts") as conn:
+                conn.executemany(_SQL_INSERT_CONTACT, rows)
+            self.logger.info(f"Added {len(rows)} contacts in bulk.")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error bulk-adding contacts: {e}", exc_info=True)
+            return False
+
+    def set_settings_bulk(self, pairs: List[tuple]) -> bool:
+        """
+        Upsert many (key, value) settings in one transaction.
+        """
+        if not pairs:
+            return True
+        try:
+            with self.transaction("settings") as conn:
+                conn.executemany(_SQL_UPSERT_SETTING, pairs)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error bulk-writing settings: {e}", exc_info=True)
+            return False
+
+    def close_all_connections_for(self, db_name: str) -> None:
+        """
+        Drain just one database's pool and writer connection.
+        """
+        with self._connection_lock:
+            pool = self.connection_pools.get(db_name)
+            if pool is not None:
+                pool.close_all()
+            writer = self._writer_connections.pop(db_name, None)
+            if writer is not None:
+                try:
+                    writer.close()
+                except Exception:
+                    self.logger.error(f"Error closing writer connection for {db_name}.", exc_info=True)
+            self.logger.info(f"Closed connections for database {db_name}.")
+
     def force_close_database_handles(self, db_name: str) -> bool:
         """
-        Force close any open file handles to the specified database.
+        Release this process's handles to the specified database.
+
+        The old msvcrt lock/unlock poke only proved we could briefly lock
+        the file; it never closed anything. Draining our own pool and
+        writer connection is what actually frees the handles, after which
+        a plain open probe confirms the file is reachable.
         """
         try:
-            db_conf: Dict[str, Any] = self.config_manager.get_database_config(db_name)
-            db_path: str = str(Path(db_conf["local_path"]).resolve())
+            db_path: str = self._db_paths[db_name]
             self.logger.info(f"Attempting to force close handles for database: {db_name}")
-            handle = msvcrt.open_osfhandle(os.open(db_path, os.O_RDWR), 0)
-            msvcrt.locking(handle, msvcrt.LK_NBLCK, 1)
-            msvcrt.locking(handle, msvcrt.LK_UNLCK, 1)
-            os.close(handle)
+            self.close_all_connections_for(db_name)
+            os.close(os.open(db_path, os.O_RDWR))
             self.logger.info(f"Successfully forced close handles for {db_name}")
             return True
         except Exception as e:
@@ -168,15 +373,44 @@ class DatabaseManager:
     def _are_handles_open(self, db_name: str) -> bool:
         """
         Check if there are open file handles to the database.
+
+        Tries a non-blocking exclusive lock on the file first — a single
+        open/lock attempt answers the question directly, where the old
+        implementation enumerated every process on the system and listed
+        each one's open files on every poll of wait_for_handles_close.
         """
+        db_path: str = self._db_paths[db_name]
+        try:
+            fd = os.open(db_path, os.O_RDWR)
+            try:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            finally:
+                os.close(fd)
+            return False
+        except FileNotFoundError:
+            # A missing file trivially has no open handles.
+            return False
+        except OSError:
+            # Locked or sharing violation: somebody still holds it.
+            return True
+        except Exception:
+            pass  # Lock probe unavailable; fall back to the process scan.
         try:
-            db_conf: Dict[str, Any] = self.config_manager.get_database_config(db_name)
-            db_path: str = str(Path(db_conf["local_path"]).resolve())
-            for proc in psutil.process_iter(["pid", "name"]):
+            pids = set(psutil.pids())
+            cache = self._proc_cache
+            for stale in cache.keys() - pids:
+                del cache[stale]
+            for pid in pids:
+                proc = cache.get(pid)
+                if proc is None:
+                    try:
+                        proc = cache[pid] = psutil.Process(pid)
+                    except psutil.NoSuchProcess:
+                        continue
                 try:
-                    for open_file in proc.open_files():
-                        if open_file.path == db_path:
-                            return True
+                    if any(f.path == db_path for f in proc.open_files()):
+                        return True
                 except (psutil.AccessDenied, psutil.NoSuchProcess):
                     continue
             return False
@@ -189,16 +423,20 @@ class DatabaseManager:
         Clean up temporary files related to the specified database.
         """
         try:
-            db_conf: Dict[str, Any] = self.config_manager.get_database_config(db_name)
-            local_db_path: Path = Path(db_conf["local_path"])
-            patterns = ["*.tmp", "*.bak", "*.old"]
-            for pattern in patterns:
-                for temp_file in local_db_path.parent.glob(f"{local_db_path.stem}{pattern}"):
+            local_db_path: Path = Path(self._db_paths[db_name])
+            stem = local_db_path.stem
+            # One directory scan covers all three suffixes; the per-pattern
+            # glob calls each re-walked the directory.
+            with os.scandir(local_db_path.parent) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not (name.startswith(stem) and name.endswith((".tmp", ".bak", ".old"))):
+                        continue
                     try:
-                        temp_file.unlink()
-                        self.logger.info(f"Deleted temporary file: {temp_file}")
+                        os.unlink(entry.path)
+                        self.logger.info(f"Deleted temporary file: {entry.path}")
                     except Exception as inner_e:
-                        self.logger.warning(f"Failed to delete temporary file {temp_file}: {inner_e}", exc_info=True)
+                        self.logger.warning(f"Failed to delete temporary file {entry.path}: {inner_e}", exc_info=True)
             return True
         except Exception as e:
             self.logger.error(f"Error cleaning up temporary files for {db_name}: {e}", exc_info=True)
@@ -206,11 +444,18 @@ class DatabaseManager:
 
     def compact_database(self, db_name: str) -> bool:
         """
-        Compact the database using VACUUM to reclaim space.
+        Compact the database, reclaiming free pages.
+
+        Databases created with auto_vacuum=INCREMENTAL reclaim up to 1000
+        pages without the exclusive lock a full VACUUM takes; older files
+        (auto_vacuum off) fall back to the full rebuild.
         """
         try:
-            with self.get_connection(db_name) as conn:
-                conn.execute("VACUUM")
+            with self.get_writer_connection(db_name) as conn:
+                if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                    conn.execute("PRAGMA incremental_vacuum(1000)")
+                else:
+                    conn.execute("VACUUM")
                 cursor = conn.execute("PRAGMA integrity_check")
                 result = cursor.fetchone()[0]
                 if result != "ok":
@@ -225,17 +470,32 @@ class DatabaseManager:
         """
         Close all connections in every connection pool.
         """
+        # Stop the maintenance timer first so it can't reopen connections
+        # on a closed manager or keep the instance alive.
+        self._closed = True
+        timer = self._optimize_timer
+        if timer is not None:
+            timer.cancel()
+            self._optimize_timer = None
         with self._connection_lock:
             for db_name, pool in self.connection_pools.items():
-                for conn_wrapper in pool.connections:
-                    try:
-                        conn_wrapper.connection.close()
-                        self.logger.info(f"Closed connection for database {db_name}.")
-                    except Exception as e:
-                        self.logger.error(f"Error closing connection for {db_name}: {e}", exc_info=True)
-                pool.connections.clear()
+                pool.close_all()
+                self.logger.info(f"Closed connections for database {db_name}.")
+            for db_name, conn in self._writer_connections.items():
+                try:
+                    conn.close()
+                except Exception:
+                    self.logger.error(f"Error closing writer connection for {db_name}.", exc_info=True)
+            self._writer_connections.clear()
             self.logger.info("All database connections have been closed.")
 
+    def __enter__(self) -> "DatabaseManager":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Close every connection deterministically on context exit."""
+        self.close_all_connections()
+
     def get_contact_by_id(self, contact_id: int) -> Optional[Dict[str, Any]]:
         """
         Fetch a contact record by its database ID.
@@ -243,19 +503,10 @@ class DatabaseManager:
         """
         try:
             with self.get_connection("contacts") as conn:
-                row = conn.execute(
-                    "SELECT id, name, email, title, phone FROM contacts WHERE id = ?",
-                    (contact_id,)
-                ).fetchone()
-                if row:
-                    return {
-                        "id": row[0],
-                        "name": row[1],
-                        "email": row[2],
-                        "title": row[3],
-                        "phone": row[4],
-                    }
-                return None
+                row = conn.execute(_SQL_GET_CONTACT, (contact_id,)).fetchone()
+                # Pooled connections use sqlite3.Row, so the C-level
+                # iterator builds the dict without per-key Python binding.
+                return dict(row) if row else None
         except Exception as e:
             self.logger.error(f"Error fetching contact by ID {contact_id}", exc_info=True)
             return None
@@ -265,16 +516,18 @@ class DatabaseManager:
         Add a new contact. Returns the new contact ID.
         """
         try:
-            with self.get_connection("contacts") as conn:
-                cursor = conn.execute(
-                    """
-                    INSERT INTO contacts (name, title, phone, email)
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    (name, title, phone, email)
-                )
+            with self.get_writer_connection("contacts") as conn:
+                if _HAS_RETURNING:
+                    # One statement returns the new id; no lastrowid
+                    # round-trip after the INSERT.
+                    row = conn.execute(
+                        _SQL_INSERT_CONTACT_RETURNING, (name, title, phone, email)
+                    ).fetchone()
+                    contact_id = row[0]
+                else:
+                    cursor = conn.execute(_SQL_INSERT_CONTACT, (name, title, phone, email))
+                    contact_id = cursor.lastrowid
                 conn.commit()
-                contact_id = cursor.lastrowid
             self.logger.info(f"Added new contact ID {contact_id}.")
             return contact_id
         except Exception as e:
@@ -286,15 +539,8 @@ class DatabaseManager:
         Update an existing contact by ID.
         """
         try:
-            with self.get_connection("contacts") as conn:
-                conn.execute(
-                    """
-                    UPDATE contacts
-                    SET name = ?, title = ?, phone = ?, email = ?
-                    WHERE id = ?
-                    """,
-                    (name, title, phone, email, contact_id)
-                )
+            with self.get_writer_connection("contacts") as conn:
+                conn.execute(_SQL_UPDATE_CONTACT, (name, title, phone, email, contact_id))
                 conn.commit()
             self.logger.info(f"Updated contact ID {contact_id} successfully.")
             return True
@@ -308,25 +554,40 @@ class DatabaseManager:
         """
         try:
             with self.get_connection("settings") as conn:
-                row = conn.execute(
-                    "SELECT value FROM settings WHERE key = ?",
-                    (key,)
-                ).fetchone()
+                row = conn.execute(_SQL_GET_SETTING, (key,)).fetchone()
                 return row[0] if row else None
         except Exception as e:
             self.logger.error(f"Error reading setting {key}", exc_info=True)
             return None
 
+    def get_settings_bulk(self, keys: List[str]) -> Dict[str, str]:
+        """
+        Read several settings in one query.
+
+        Returns a dict of key -> value for the keys that exist; callers pay
+        one connection checkout and one SELECT instead of one per key.
+        """
+        if not keys:
+            return {}
+        try:
+            placeholders = ",".join("?" * len(keys))
+            with self.get_connection("settings") as conn:
+                rows = conn.execute(
+                    f"SELECT key, value FROM settings WHERE key IN ({placeholders})",
+                    list(keys)
+                ).fetchall()
+                return dict(rows)
+        except Exception as e:
+            self.logger.error(f"Error reading settings {keys}", exc_info=True)
+            return {}
+
     def set_setting(self, key: str, value: str) -> None:
         """
         Insert or update a setting in the settings table.
         """
         try:
-            with self.get_connection("settings") as conn:
-                conn.execute("""
-                    INSERT INTO settings (key, value) VALUES (?, ?)
-                    ON CONFLICT(key) DO UPDATE SET value=excluded.value;
-                """, (key, value))
+            with self.get_writer_connection("settings") as conn:
+                conn.execute(_SQL_UPSERT_SETTING, (key, value))
                 conn.commit()
         except Exception as e:
             self.logger.error(f"Error writing setting {key}", exc_info=True)
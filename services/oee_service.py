@@ -37,7 +37,12 @@ Typical usage
 from __future__ import annotations
 
 from dataclasses import dataclass, asdict
-from typing import Dict
+from typing import Dict, Iterable, List
+
+
+def _coerce(val: float | int | str | None) -> float:
+    """Coerce one raw payload value to float; blank strings/None become 0."""
+    return 0.0 if val == "" or val is None else float(val)
 
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -66,13 +71,50 @@ class OEEInputs:
         • Silently converts blank strings to 0.
         • Coerces everything to float.
         """
-        kw = {}
-        for field in cls.__dataclass_fields__:
-            val = d.get(field, 0)
-            if val == "" or val is None:
-                val = 0
-            kw[field] = float(val)
-        return cls(**kw)
+        # The schema is fixed, so straight-line positional construction
+        # beats iterating __dataclass_fields__ with a dict build per call.
+        g = d.get
+        c = _coerce
+        return cls(
+            c(g("runtime", 0)),
+            c(g("planned_downtime", 0)),
+            c(g("unplanned_downtime", 0)),
+            c(g("total_parts", 0)),
+            c(g("cycle_time", 0)),
+            c(g("total_scrap", 0)),
+        )
+
+
+@dataclass(slots=True)
+class OEEResult:
+    """
+    Slots-backed result record: attribute writes instead of a 20-key dict
+    insert per call. `compute_oee` converts to a plain dict only at the
+    JSON boundary.
+    """
+    # ---- outputs ----
+    oee: float
+    capacity: float
+    total_produced: float
+    performance: float
+    quality: float
+    availability: float
+    # ---- inputs (rounded to match UI) ----
+    runtime: float                 # hours
+    planned_downtime: float        # minutes
+    unplanned_downtime: float      # minutes
+    total_parts: float
+    total_scrap: float
+    cycle_time: float              # seconds/part (ideal)
+    nominalcycletime: float        # alias for template
+    # ---- useful intermediates ----
+    runtime_sec: float
+    planned_downtime_sec: float
+    unplanned_downtime_sec: float
+    planned_production_time_sec: float
+    operating_time_sec: float
+    ideal_parts: float
+    good_parts: float
 
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -83,15 +125,10 @@ def _safe_pct(numerator: float, denominator: float) -> float:
     return (numerator / denominator * 100.0) if denominator else 0.0
 
 
-def _round2(value: float) -> float:
-    """Round to two decimal places for UI consistency."""
-    return round(value, 0)
-
-
 # ────────────────────────────────────────────────────────────────────────────────
 # Core public API
 # ────────────────────────────────────────────────────────────────────────────────
-def compute_oee(raw: Dict[str, float | int | str]) -> Dict[str, float]:
+def compute_oee_result(raw: Dict[str, float | int | str] | OEEInputs) -> OEEResult:
     if isinstance(raw, OEEInputs):
         inp = raw
     else:
@@ -101,44 +138,71 @@ def compute_oee(raw: Dict[str, float | int | str]) -> Dict[str, float]:
     planned_downtime_sec   = inp.planned_downtime * 60.0
     unplanned_downtime_sec = inp.unplanned_downtime * 60.0
 
-    planned_production_time = max(runtime_sec - planned_downtime_sec, 0.0)
-    operating_time          = max(planned_production_time - unplanned_downtime_sec, 0.0)
+    # Straight-line clamps: downtime inputs are non-negative, so clamping
+    # the running difference needs one comparison per stage, not a max()
+    # call each.
+    ppt = runtime_sec - planned_downtime_sec
+    planned_production_time = ppt if ppt > 0.0 else 0.0
+    operating_time = planned_production_time - unplanned_downtime_sec
+    if operating_time < 0.0:
+        operating_time = 0.0
 
     availability = _safe_pct(operating_time, planned_production_time)
     ideal_parts  = operating_time / inp.cycle_time if inp.cycle_time else 0.0
     performance  = _safe_pct(inp.total_parts, ideal_parts)
     good_parts   = max(inp.total_parts - inp.total_scrap, 0.0)
     quality      = _safe_pct(good_parts, inp.total_parts)
-    oee          = (availability/100.0) * (performance/100.0) * (quality/100.0) * 100.0
+    # Folded form of (a/100)*(p/100)*(q/100)*100 — one multiply chain
+    # instead of three divisions.
+    oee          = availability * performance * quality * 1e-4
     capacity     = (inp.total_parts / inp.runtime) if inp.runtime else 0.0
 
-    return {
-        # ---- outputs (rounded) ----
-        "oee":              _round2(oee),
-        "capacity":         _round2(capacity),
-        "total_produced":   _round2(inp.total_parts),
-        "performance":      _round2(performance),
-        "quality":          _round2(quality),
-        "availability":     _round2(availability),
-
-        # ---- inputs (rounded to match UI; keep raw if you prefer) ----
-        "runtime":          _round2(inp.runtime),            # hours
-        "planned_downtime": _round2(inp.planned_downtime),   # minutes
-        "unplanned_downtime": _round2(inp.unplanned_downtime), # minutes
-        "total_parts":      _round2(inp.total_parts),
-        "total_scrap":      _round2(inp.total_scrap),
-        "cycle_time":       _round2(inp.cycle_time),         # seconds/part (ideal)
-        "nominalcycletime": _round2(inp.cycle_time),         # alias for template
-
-        # ---- useful intermediates (optional, rounded) ----
-        "runtime_sec":                    _round2(runtime_sec),
-        "planned_downtime_sec":           _round2(planned_downtime_sec),
-        "unplanned_downtime_sec":         _round2(unplanned_downtime_sec),
-        "planned_production_time_sec":    _round2(planned_production_time),
-        "operating_time_sec":             _round2(operating_time),
-        "ideal_parts":                    _round2(ideal_parts),
-        "good_parts":                     _round2(good_parts),
-    }
+    # The builtin rounds in C — no Python frame per field, unlike a
+    # module-level wrapper.
+    r = round
+    return OEEResult(
+        oee=r(oee, 2),
+        capacity=r(capacity, 2),
+        total_produced=r(inp.total_parts, 2),
+        performance=r(performance, 2),
+        quality=r(quality, 2),
+        availability=r(availability, 2),
+        runtime=r(inp.runtime, 2),
+        planned_downtime=r(inp.planned_downtime, 2),
+        unplanned_downtime=r(inp.unplanned_downtime, 2),
+        total_parts=r(inp.total_parts, 2),
+        total_scrap=r(inp.total_scrap, 2),
+        cycle_time=r(inp.cycle_time, 2),
+        nominalcycletime=r(inp.cycle_time, 2),
+        runtime_sec=r(runtime_sec, 2),
+        planned_downtime_sec=r(planned_downtime_sec, 2),
+        unplanned_downtime_sec=r(unplanned_downtime_sec, 2),
+        planned_production_time_sec=r(planned_production_time, 2),
+        operating_time_sec=r(operating_time, 2),
+        ideal_parts=r(ideal_parts, 2),
+        good_parts=r(good_parts, 2),
+    )
+
+
+def compute_oee(raw: Dict[str, float | int | str] | OEEInputs) -> Dict[str, float]:
+    """Dict façade over :func:`compute_oee_result` for JSON-bound callers."""
+    return asdict(compute_oee_result(raw))
+
+
+def compute_oee_batch(
+    rows: Iterable[Dict[str, float | int | str] | OEEInputs]
+) -> List[Dict[str, float]]:
+    """
+    Compute OEE for many shifts/machines in one call.
+
+    Binding `compute_oee` to a local keeps the per-row dispatch to a single
+    fast-local load inside the comprehension, so dashboards and exports can
+    hand over a whole result set instead of calling the scalar façade in
+    their own loop.
+    """
+    _compute = compute_oee
+    return [_compute(row) for row in rows]
+
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Optional fine-grained API (mirrors methods in your Qt widget)
@@ -152,20 +216,20 @@ def compute_availability(runtime_hrs: float,
     unplanned_sec = unplanned_down_min * 60.0
     planned_production = max(runtime_sec - planned_sec, 0.0)
     operating_time     = max(planned_production - unplanned_sec, 0.0)
-    return _round2(_safe_pct(operating_time, planned_production))
+    return round(_safe_pct(operating_time, planned_production), 2)
 
 
 def compute_performance(operating_time_sec: float,
                         total_parts: float,
                         cycle_time_sec: float) -> float:
     ideal_parts = operating_time_sec / cycle_time_sec if cycle_time_sec else 0.0
-    return _round2(_safe_pct(total_parts, ideal_parts))
+    return round(_safe_pct(total_parts, ideal_parts), 2)
 
 
 def compute_quality(total_parts: float, scrap_parts: float) -> float:
     good_parts = max(total_parts - scrap_parts, 0.0)
-    return _round2(_safe_pct(good_parts, total_parts))
+    return round(_safe_pct(good_parts, total_parts), 2)
 
 
 def compute_capacity(total_parts: float, runtime_hrs: float) -> float:
-    return _round2(total_parts / runtime_hrs) if runtime_hrs else 0.0
+    return round(total_parts / runtime_hrs, 2) if runtime_hrs else 0.0
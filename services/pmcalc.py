@@ -12,13 +12,14 @@ and calculates standard project milestones.
 
 from __future__ import annotations
 
+import functools
 import logging
-import math
-from dataclasses import dataclass
+import os
+import pickle
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta, date
-from typing import Any, List
-
-import pyxlsb  # pip install pyxlsb
+from typing import Any, Generator, List, Optional
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Constants – make the mapping obvious.
@@ -29,8 +30,23 @@ COL_STAGE       = 1   # Excel col B   → zero-based 1
 COL_START       = 5   # Excel col F   → zero-based 5
 COL_END         = 6   # Excel col G   → zero-based 6
 
+# The three grid columns in extraction order, so the read loop unpacks one
+# generator instead of three separate index/attribute chains.
+_GRID_COLS = (COL_STAGE, COL_START, COL_END)
+
 logger = logging.getLogger(__name__)
 
+# Exact-type dispatch for cell normalisation: one dict lookup instead of a
+# chain of isinstance checks. bool rides along since it subclasses int but
+# hashes to its own type key.
+_DAY_DISPATCH = {
+    int: int,
+    float: int,
+    bool: int,
+    datetime: datetime.toordinal,
+    date: date.toordinal,
+}
+
 
 @dataclass
 class MilestoneResults:
@@ -54,31 +70,99 @@ class ProjectMilestonesCalculator:
         self.raw_data_2d: List[List[float]] = []   # [[stage, start_serial, end_serial], ...]
         self.with_extra_col: List[int] = []        # weeks per stage row
         self.final_values: MilestoneResults = MilestoneResults()
+        self._cost: Optional[float] = None         # Summary!J306, once read
+        # Struct-of-arrays mirror of raw_data_2d: the pipeline walks these
+        # parallel lists (day numbers pre-converted, None for bad rows)
+        # instead of re-dispatching _as_day_number per row element.
+        self._stages: List[str] = []
+        self._start_serials: List[Optional[int]] = []
+        self._end_serials: List[Optional[int]] = []
 
     # ────────────────────────────────────────────────────────────────────
     # Helpers
     # ────────────────────────────────────────────────────────────────────
+    def _build_soa(self) -> None:
+        """Split raw_data_2d into the parallel stage/serial arrays."""
+        stages: List[str] = []
+        starts: List[Optional[int]] = []
+        ends: List[Optional[int]] = []
+        as_day = self._as_day_number
+        for idx, row in enumerate(self.raw_data_2d):
+            stages.append(row[0].strip() if isinstance(row[0], str) else str(row[0]))
+            try:
+                s: Optional[int] = as_day(row[1])
+                e: Optional[int] = as_day(row[2])
+            except Exception as exc:
+                logger.error("PMCalc:   ! row %-2d %r  → %s",
+                             ROW_FIRST_STAGE + idx + 1, row, exc)
+                s = e = None
+            starts.append(s)
+            ends.append(e)
+        self._stages = stages
+        self._start_serials = starts
+        self._end_serials = ends
+
     @staticmethod
     def _as_day_number(value: Any) -> int:
         """
         Normalise whatever we get from Excel into an *integer day count*
         so that simple subtraction == “days between”.
         """
-        if value in (None, ""):
+        if value is None or value == "":
             raise ValueError("Empty cell")
 
-        if isinstance(value, (int, float)):
-            return int(value)
+        fn = _DAY_DISPATCH.get(type(value))
+        if fn is None:
+            raise TypeError(f"Unsupported cell type {type(value)} for {value!r}")
+        return fn(value)
 
-        if isinstance(value, (datetime, date)):
-            return value.toordinal()
+    # ────────────────────────────────────────────────────────────────────
+    # Sidecar cache – the whole XLSB is parsed for ~20 cells, so persist
+    # the extracted values next to the workbook and reload them while the
+    # file's mtime is unchanged.
+    # ────────────────────────────────────────────────────────────────────
+    def _cache_path(self) -> str:
+        return f"{self.filename}.pmcache"
 
-        raise TypeError(f"Unsupported cell type {type(value)} for {value!r}")
+    def _load_cache(self) -> dict | None:
+        """Return the sidecar payload if it matches the workbook's mtime."""
+        try:
+            st = os.stat(self.filename)
+            with open(self._cache_path(), "rb") as f:
+                payload = pickle.load(f)
+            if payload.get("mtime") == st.st_mtime_ns:
+                return payload
+        except Exception:
+            pass
+        return None
+
+    def _store_cache(self, **updates: Any) -> None:
+        """Merge *updates* into the sidecar, written atomically."""
+        try:
+            payload = self._load_cache() or {"mtime": os.stat(self.filename).st_mtime_ns}
+            payload.update(updates)
+            tmp = self._cache_path() + ".tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._cache_path())
+        except Exception:
+            logger.debug("PMCalc: could not write sidecar cache", exc_info=True)
+
+    @contextmanager
+    def _open_wb(self) -> Generator[Any, None, None]:
+        """
+        Open the workbook once so several reads can share one parse of the
+        zipped XLSB container.
+        """
+        import pyxlsb  # deferred: callers served by the sidecar cache never pay for it
+
+        with pyxlsb.open_workbook(self.filename) as wb:
+            yield wb
 
     # ────────────────────────────────────────────────────────────────────
     # Step 1 – Read Lead-time grid
     # ────────────────────────────────────────────────────────────────────
-    def read_cost_grid_data(self) -> None:
+    def read_cost_grid_data(self, wb: Optional[Any] = None) -> None:
         """
         Populate *self.raw_data_2d* with triples from **Leadtime!B10,F10,G10–B28,F28,G28**:
 
@@ -86,24 +170,36 @@ class ProjectMilestonesCalculator:
               [stage:str, start_serial:float, end_serial:float],
               ...
             ]
+
+        Pass an already-open workbook to share its handle with other reads;
+        otherwise one is opened for this call.
         """
         ROW_LAST_STAGE = ROW_FIRST_STAGE + 18  # Excel row 28 → zero-based 27
         data: List[List[float]] = []
 
+        if wb is None:
+            payload = self._load_cache()
+            if payload is not None and "raw" in payload:
+                self.raw_data_2d = payload["raw"]
+                logger.info("PMCalc: loaded %d rows from sidecar cache", len(self.raw_data_2d))
+                return
+
         try:
-            with pyxlsb.open_workbook(self.filename) as wb:
+            with (self._open_wb() if wb is None else nullcontext(wb)) as wb:
                 with wb.get_sheet("Leadtime") as sheet:
                     for r_idx, row in enumerate(sheet.rows()):
-                        if r_idx < ROW_FIRST_STAGE or r_idx > ROW_LAST_STAGE:
+                        if r_idx < ROW_FIRST_STAGE:
                             continue
+                        if r_idx > ROW_LAST_STAGE:
+                            # Everything below the stage grid is irrelevant;
+                            # stop decoding BIFF12 records early.
+                            break
 
                         if len(row) <= COL_END:
                             logger.warning("PMCalc: row %d too short – skipped", r_idx + 1)
                             continue
 
-                        stage_cell = row[COL_STAGE].v
-                        start_cell = row[COL_START].v
-                        end_cell   = row[COL_END].v
+                        stage_cell, start_cell, end_cell = (row[c].v for c in _GRID_COLS)
 
                         try:
                             start_serial = float(start_cell) if start_cell is not None else None
@@ -127,8 +223,10 @@ class ProjectMilestonesCalculator:
             raise RuntimeError("PMCalc: no valid dates found in Leadtime!B10,G28")
 
         self.raw_data_2d = data
+        self._store_cache(raw=data)
         logger.info("PMCalc: read %d rows from Leadtime!B10,G28", len(data))
-        logger.debug("PMCalc: raw_data_2d = %s", self.raw_data_2d)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("PMCalc: raw_data_2d = %s", self.raw_data_2d)
 
     # ────────────────────────────────────────────────────────────────────
     # Step 2 – Compute “D” (weeks-to-finish) column
@@ -143,40 +241,47 @@ class ProjectMilestonesCalculator:
             logger.info("PMCalc: raw_data empty – loading Leadtime data")
             self.read_cost_grid_data()
 
+        # Rebuild the parallel arrays whenever raw_data_2d has been
+        # replaced since the last split (cache load, fresh read, tests).
+        if len(self._end_serials) != len(self.raw_data_2d):
+            self._build_soa()
+
         # Project start = Leadtime!F10 (first data row’s *start* date)
         try:
-            project_start_serial = self._as_day_number(self.raw_data_2d[0][1])
+            project_start_serial = self._start_serials[0]
+            if project_start_serial is None:
+                raise ValueError("Empty cell")
         except Exception as exc:
             raise RuntimeError("PMCalc: could not determine project start date (Leadtime!F10)") from exc
 
         logger.info("PMCalc: project_start serial = %s", project_start_serial)
 
-        # Walk the stage rows
-        self.with_extra_col = []
-        for idx, row in enumerate(self.raw_data_2d):
-            excel_row_num = ROW_FIRST_STAGE + idx + 1  # +1 to get Excel’s 1-based row
-            try:
-                stage        = row[0].strip() if isinstance(row[0], str) else str(row[0])
-                start_serial = self._as_day_number(row[1])
-                end_serial   = self._as_day_number(row[2])
-            except Exception as exc:
-                logger.error("PMCalc:   ! row %-2d %r  → %s", excel_row_num, row, exc)
-                self.with_extra_col.append(0)
+        # Walk the pre-converted end serials: integer math only, bad rows
+        # already flagged as None by _build_soa.
+        debug = logger.isEnabledFor(logging.DEBUG)
+        weeks_col: List[int] = []
+        append = weeks_col.append
+        for idx, end_serial in enumerate(self._end_serials):
+            if end_serial is None:
+                append(0)
                 continue
 
             numerator_days = end_serial - project_start_serial
-            weeks_float    = numerator_days / 7
-            weeks          = math.ceil(weeks_float) if numerator_days > 0 else 0
-            self.with_extra_col.append(weeks)
-
-            logger.debug(
-                "PMCalc: Row %-2d | %-25s | start=%6d | end=%6d | "
-                "num_days=%5d | weeks_flt=%8.3f | weeks=%2d",
-                excel_row_num, stage, start_serial, end_serial,
-                numerator_days, weeks_float, weeks
-            )
-
-        logger.info("PMCalc: final weeks column = %s", self.with_extra_col)
+            weeks = -(-numerator_days // 7) if numerator_days > 0 else 0
+            append(weeks)
+
+            if debug:
+                logger.debug(
+                    "PMCalc: Row %-2d | %-25s | start=%6d | end=%6d | "
+                    "num_days=%5d | weeks_flt=%8.3f | weeks=%2d",
+                    ROW_FIRST_STAGE + idx + 1, self._stages[idx],
+                    self._start_serials[idx], end_serial,
+                    numerator_days, numerator_days / 7, weeks
+                )
+
+        self.with_extra_col = weeks_col
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("PMCalc: final weeks column = %s", self.with_extra_col)
 
     # ────────────────────────────────────────────────────────────────────
     # Step 3 – Milestone formulas
@@ -213,21 +318,42 @@ class ProjectMilestonesCalculator:
     # ────────────────────────────────────────────────────────────────────
     # Misc helpers (unchanged)
     # ────────────────────────────────────────────────────────────────────
-    def get_project_cost(self) -> float:
+    def get_project_cost(self, wb: Optional[Any] = None) -> float:
         """
         Reads cell J306 from 'Summary' sheet and returns it as float.
+
+        Accepts an already-open workbook so callers combining this with
+        read_cost_grid_data parse the container once.
         """
+        if wb is None:
+            if self._cost is not None:
+                return self._cost
+            payload = self._load_cache()
+            if payload is not None and payload.get("cost") is not None:
+                self._cost = payload["cost"]
+                return self._cost
+
         try:
-            with pyxlsb.open_workbook(self.filename) as wb:
+            with (self._open_wb() if wb is None else nullcontext(wb)) as wb:
                 with wb.get_sheet("Summary") as sheet:
                     for idx, row in enumerate(sheet.rows(), start=1):
-                        if idx == 306:
-                            if len(row) >= 10 and row[9].v is not None:
-                                try:
-                                    return float(row[9].v)
-                                except Exception:
-                                    raise ValueError(f"Invalid cost value in J306: {row[9].v}")
+                        # Rows 1-305 are skipped without touching a single
+                        # cell object; only the target row pays for access.
+                        if idx < 306:
+                            continue
+                        try:
+                            value = row[9].v
+                        except IndexError:
+                            value = None
+                        if value is None:
                             raise ValueError("Cannot read cell J306 (row too short or empty)")
+                        try:
+                            cost = float(value)
+                        except Exception:
+                            raise ValueError(f"Invalid cost value in J306: {value}")
+                        self._cost = cost
+                        self._store_cache(cost=cost)
+                        return cost
             raise ValueError("Sheet 'Summary' or row 306 not found")
         except Exception:
             logger.error("Error reading 'Summary' cost", exc_info=True)
@@ -239,8 +365,47 @@ class ProjectMilestonesCalculator:
     def calculate_all(self) -> MilestoneResults:
         """
         read → compute weeks → derive milestones → return MilestoneResults
+
+        Results are memoized per (path, mtime, size), so repeated quote
+        refreshes against an unchanged workbook skip the XLSB parse.
+        """
+        st = os.stat(self.filename)
+        cached = _calc_all_cached(os.path.abspath(self.filename), st.st_mtime_ns, st.st_size)
+        # Hand back a copy so caller mutation can't poison the cache.
+        self.final_values = replace(cached)
+        return self.final_values
+
+    def _read_all(self) -> None:
+        """
+        Read both sheets in one workbook session.
+
+        The container's zip directory and shared strings are parsed once
+        for Leadtime and Summary together; a warm sidecar cache skips the
+        open entirely.
         """
-        self.read_cost_grid_data()
+        payload = self._load_cache() or {}
+        if payload.get("raw") is not None and payload.get("cost") is not None:
+            self.raw_data_2d = payload["raw"]
+            self._cost = payload["cost"]
+            logger.info("PMCalc: loaded %d rows and cost from sidecar cache",
+                        len(self.raw_data_2d))
+            return
+        with self._open_wb() as wb:
+            self.read_cost_grid_data(wb)
+            self._cost = self.get_project_cost(wb)
+
+    def _run_pipeline(self) -> MilestoneResults:
+        """Uncached read → weeks → milestones pass over this instance."""
+        self._read_all()
         self.compute_d_column()
         self.compute_final_values()
         return self.final_values
+
+
+@functools.lru_cache(maxsize=128)
+def _calc_all_cached(path: str, mtime_ns: int, size: int) -> MilestoneResults:
+    """
+    Milestone pipeline keyed on stat metadata: the mtime/size key
+    invalidates automatically whenever the workbook changes on disk.
+    """
+    return ProjectMilestonesCalculator(path)._run_pipeline()
@@ -147,14 +147,18 @@ class SyncService:
             self.sync_thread.start()
             self.logger.info("Sync thread started.")
 
-    def stop_sync_thread(self) -> None:
+    def stop_sync_thread(self, timeout: float = 30) -> None:
         """
         Stop the background synchronization thread gracefully.
+
+        Args:
+            timeout (float): Maximum seconds to wait for the worker to drain;
+                shutdown paths pass a short timeout so they never hang.
         """
         self.running = False
         if self.sync_thread and self.sync_thread.is_alive():
             self.sync_queue.put(None)  # Signal termination
-            self.sync_thread.join(timeout=30)
+            self.sync_thread.join(timeout=timeout)
             self.logger.info("Sync thread stopped.")
 
     def _sync_worker(self) -> None:
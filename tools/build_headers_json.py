@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# File: tools/build_headers_json.py
+"""
+Regenerate models/headers.json from the literals in models/headers.py.
+
+The sidecar lets headers.py skip evaluating its large dict literals at
+import time. Run this after editing header_data/key_data.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def main() -> None:
+    target = ROOT / "models" / "headers.json"
+    # Remove any existing sidecar first so the import below evaluates the
+    # literals rather than copying potentially stale sidecar data.
+    target.unlink(missing_ok=True)
+
+    import models.headers as headers
+
+    payload = {
+        "header_data": {k: list(v) for k, v in headers.header_data.items()},
+        "key_data": {k: list(v) for k, v in headers.key_data.items()},
+    }
+    target.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    print(f"Wrote {target}")
+
+
+if __name__ == "__main__":
+    main()
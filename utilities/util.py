@@ -11,11 +11,12 @@ from typing import Any, Dict
 
 logger: logging.Logger = logging.getLogger(__name__)
 
-def merge_nested_dict(d: Dict[str, Any], key: str, value: Any) -> None:
+def merge_nested_dict(d: Dict[str, Any], key: str, value: Any,
+                      parts: list | None = None) -> None:
     """
     Merge a value into a nested dictionary using a dot-separated key.
 
-    This function traverses the dictionary 'd' using the keys specified in the 
+    This function traverses the dictionary 'd' using the keys specified in the
     dot-separated string 'key'. If any intermediate key does not exist or is not a
     dictionary, it is created. Finally, the value is set for the last key.
 
@@ -23,12 +24,14 @@ def merge_nested_dict(d: Dict[str, Any], key: str, value: Any) -> None:
         d (Dict[str, Any]): The dictionary into which the value should be merged.
         key (str): Dot-separated key string (e.g., "a.b.c") indicating the nested keys.
         value (Any): The value to set for the final key.
+        parts (list | None): The key already split on '.', for callers that
+            have split it anyway; saves a str.split per merge in bulk loads.
 
     Raises:
         Exception: Propagates any exception encountered during the merge process.
     """
     try:
-        keys = key.split('.')
+        keys = parts if parts is not None else key.split('.')
         current: Dict[str, Any] = d
         for k in keys[:-1]:
             if k not in current or not isinstance(current[k], dict):
@@ -20,15 +20,16 @@ from pathlib import Path
 from models.headers import (
     header_data,
     key_data,
-    budgetary_categories,
-    final_categories,
     all_categories_order,
     optional_categories,
     incoterms_list,
     weeks_after_po_options,
-    categories_with_add_button,
     spellcheck_categories,
-    file_browse_fields
+    file_browse_fields,
+    BUDGETARY_CATEGORIES,
+    FINAL_CATEGORIES,
+    OPTIONAL_CATEGORIES,
+    CATEGORIES_WITH_ADD_BUTTON,
 )
 
 logger = logging.getLogger(__name__)
@@ -138,18 +139,18 @@ class QuoteViewModel:
     def get_categories(self, quote_type: str) -> List[str]:
         qt = quote_type.strip().lower()
         if qt == "budgetary":
-            cats = set(budgetary_categories)
+            cats = BUDGETARY_CATEGORIES
         elif qt == "final":
-            cats = set(final_categories)
+            cats = FINAL_CATEGORIES
         else:
-            cats = set()
+            cats = frozenset()
         return [c for c in all_categories_order if c in cats]
 
     def get_category_fields(self, category: str) -> List[Dict[str, Any]]:
         labels = header_data.get(category, [])
         keys = key_data.get(category, [])
         fields = []
-        is_optional = category in optional_categories
+        is_optional = category in OPTIONAL_CATEGORIES
         for label, key in zip(labels, keys):
             fields.append({
                 "label": label,
@@ -159,7 +160,7 @@ class QuoteViewModel:
         return fields
 
     def category_can_add(self, category: str) -> bool:
-        return category in categories_with_add_button
+        return category in CATEGORIES_WITH_ADD_BUTTON
 
     def get_special_lists(self) -> Dict[str, List[str]]:
         return {
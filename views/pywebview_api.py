@@ -10,6 +10,7 @@ from typing import Optional
 from services.oee_service import compute_oee
 from pathlib import Path
 from config.settings import Settings
+from models.headers import HEADERS_PAYLOAD
 from viewmodels.quote_viewmodel import QuoteViewModel
 
 logger = logging.getLogger(__name__)
@@ -61,6 +62,13 @@ class PyWebViewAPI:
 
 
 
+    def get_headers_payload(self) -> str:
+        """
+        Return the pre-serialized header metadata blob (headers.py literals);
+        JS parses the cached string once instead of per-field round-trips.
+        """
+        return HEADERS_PAYLOAD
+
     def get_quote_type(self) -> str:
         """
         Let JS know whether we're in 'budgetary' or 'final' mode.